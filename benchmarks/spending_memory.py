@@ -0,0 +1,66 @@
+"""
+Замер памяти spending_by_category на синтетических данных
+
+Запуск: python benchmarks/spending_memory.py [число строк]
+
+Для DataFrame в формате выгрузки, канонического DataFrame и TransactionStore выводятся
+размер исходных данных, размер результата, пик выделенной памяти во время вызова
+(tracemalloc) и прирост пикового RSS процесса.
+"""
+import gc
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import reports  # noqa: E402
+from src.transactions import TransactionStore, normalize_transactions  # noqa: E402
+from synthetic import CATEGORIES, make_statement  # noqa: E402
+
+
+def max_rss_mb() -> float:
+    """Пиковый RSS процесса в мегабайтах (ru_maxrss в Linux - в килобайтах)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(name: str, transactions, size_mb: float) -> None:
+    """Вызывает spending_by_category и печатает замеры"""
+    reports.spending_cache.clear()
+    gc.collect()
+    rss_before = max_rss_mb()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = reports.spending_by_category(transactions, CATEGORIES[1], "31.12.2021")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result_mb = result.memory_usage(deep=True).sum() / 2 ** 20
+    print(f"{name:<12} данные {size_mb:9.1f} МБ  результат {result_mb:7.2f} МБ ({len(result)} строк)  "
+          f"пик {peak / 2 ** 20:8.2f} МБ  прирост RSS {max_rss_mb() - rss_before:8.1f} МБ  {elapsed:6.2f} с")
+
+
+def main(rows: int) -> None:
+    logging.disable(logging.INFO)
+    # Замеряем отбор операций, а не запись файла отчета
+    reports.write_report = lambda *args, **kwargs: None
+
+    df = make_statement(rows)
+    normalized = normalize_transactions(df)
+    store = TransactionStore(normalized)
+
+    print(f"Строк: {rows}")
+    measure("выгрузка", df, df.memory_usage(deep=True).sum() / 2 ** 20)
+    measure("канонический", normalized, normalized.memory_usage(deep=True).sum() / 2 ** 20)
+    measure("хранилище", store, store.df.memory_usage(deep=True).sum() / 2 ** 20)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
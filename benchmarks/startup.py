@@ -0,0 +1,68 @@
+"""
+Замер времени запуска командной строки
+
+Запуск: python benchmarks/startup.py [число повторов]
+
+Каждая команда src/main.py запускается в отдельном процессе с python -X importtime.
+Выводится медиана времени до первой строки вывода, суммарное время импортов
+(по отчету importtime) и то, были ли импортированы pandas и requests.
+Для сравнения замеряется импорт src.views и src.reports - то, что раньше делал
+main.py при любом запуске.
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "src" / "main.py"
+
+COMMANDS = {
+    "main.py --help": [str(MAIN), "--help"],
+    "main.py settings": [str(MAIN), "settings"],
+    "import views, reports": ["-c", "import src.views, src.reports; print('ok')"],
+}
+
+HEAVY_MODULES = ("pandas", "requests")
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Разбирает отчет python -X importtime: {модуль: собственное время импорта в мкс}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_once(args: List[str]) -> tuple:
+    """Запускает команду и возвращает (секунды до первой строки вывода, отчет importtime)"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    process.stdout.readline()
+    first_output = time.perf_counter() - started
+    _, stderr = process.communicate()
+    return first_output, parse_importtime(stderr)
+
+
+def main(repeats: int) -> None:
+    print(f"{'команда':<24}{'до вывода, мс':>15}{'импорты, мс':>14}  тяжелые модули")
+    for name, args in COMMANDS.items():
+        timings = []
+        for _ in range(repeats):
+            first_output, modules = run_once(args)
+            timings.append(first_output)
+        imports_ms = sum(modules.values()) / 1000
+        heavy = [module for module in HEAVY_MODULES if module in modules] or ["-"]
+        print(f"{name:<24}{statistics.median(timings) * 1000:>15.1f}{imports_ms:>14.1f}  {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,294 @@
+"""
+Набор замеров скорости и памяти отчетов на синтетических выписках
+
+Запуск:
+    python benchmarks/suite.py                          # 10k и 1m строк, вывод таблицы
+    python benchmarks/suite.py --sizes 10k,1m,10m       # с выборкой на 10 млн строк
+    python benchmarks/suite.py --check                  # сравнение с benchmarks/baseline.json
+    python benchmarks/suite.py --save-baseline          # запись текущих замеров как базовых
+
+Для каждого размера выписка генерируется один раз (synthetic.make_statement) и по ней
+замеряются filter_data_by_date, get_card_summary, get_top_transactions, spending_by_category,
+investment_bank и запись отчета. Время - медиана из --repeats запусков, пропускная способность -
+строк входных данных в секунду, пик памяти - отдельный запуск под tracemalloc.
+
+При --check замер считается регрессией, если время больше базового более чем на
+--time-tolerance или пик памяти - более чем на --memory-tolerance; тогда код возврата 1.
+Базовые значения зависят от машины: после смены окружения их нужно записать заново.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import reports  # noqa: E402
+from src.services import investment_bank, investment_bank_df  # noqa: E402
+from src.transactions import TransactionStore  # noqa: E402
+from src.views import filter_data_by_date, get_card_summary, get_top_transactions  # noqa: E402
+from synthetic import make_statement  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_SIZES = "10k,1m"
+
+# Параметры отчетов: последний месяц синтетической выписки (2019-01-01 + 3 года)
+SUMMARY_DATE = "2021-12-31 23:59:59"
+REPORT_DATE = "31.12.2021"
+MONTH = "2021-12"
+CATEGORY = "Супермаркеты"
+LIMIT = 50
+
+# investment_bank по списку словарей и запись отчета замеряются не больше чем на стольких строках:
+# их время линейно по числу строк, а полный размер сделал бы прогон на 10 млн строк слишком долгим
+LIST_MAX_ROWS = 1_000_000
+REPORT_MAX_ROWS = 100_000
+
+# Допустимое ухудшение относительно базовых значений
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+# Изменения пика памяти меньше этого порога не считаются регрессией
+MEMORY_SLACK_MB = 1.0
+
+
+class Case:
+    """Замер: функция без аргументов, вызываемая по подготовленным данным, и число строк на входе"""
+
+    def __init__(self, name: str, func: Callable[[], Any], rows: int):
+        self.name = name
+        self.func = func
+        self.rows = rows
+
+
+def build_cases(df: pd.DataFrame, store: TransactionStore, output_dir: Path) -> List[Case]:
+    """
+    Готовит замеры для одной выписки
+
+    Args:
+        df: Выписка в каноническом виде
+        store: Хранилище операций из той же выписки
+        output_dir: Каталог для файлов отчетов
+
+    Returns:
+        Список замеров
+    """
+    rows = len(df)
+
+    # Отчеты вызываются без декоратора report_writer, а кэш сбрасывается: замеряется сам расчет
+    def spending(transactions):
+        reports.spending_cache.clear()
+        return reports.spending_by_category.__wrapped__(transactions, CATEGORY, REPORT_DATE)
+
+    list_rows = min(rows, LIST_MAX_ROWS)
+    records = df[["Дата операции", "Сумма операции"]].head(list_rows).to_dict("records")
+
+    report_rows = min(rows, REPORT_MAX_ROWS)
+    report_df = df.head(report_rows)
+
+    return [
+        Case("filter_data_by_date", lambda: filter_data_by_date(df, SUMMARY_DATE), rows),
+        Case("filter_data_by_date[store]", lambda: filter_data_by_date(store, SUMMARY_DATE), rows),
+        Case("get_card_summary", lambda: get_card_summary(df), rows),
+        Case("get_top_transactions", lambda: get_top_transactions(df), rows),
+        Case("spending_by_category", lambda: spending(df), rows),
+        Case("spending_by_category[store]", lambda: spending(store), rows),
+        Case("investment_bank_df", lambda: investment_bank_df(MONTH, df, LIMIT), rows),
+        Case("investment_bank_df[store]", lambda: investment_bank_df(MONTH, store, LIMIT), rows),
+        Case("investment_bank[list]", lambda: investment_bank(MONTH, records, LIMIT), list_rows),
+        Case("write_report[json]",
+             lambda: reports.write_report(report_df, str(output_dir / "report.json"), "bench"), report_rows),
+        Case("write_report[jsonl]",
+             lambda: reports.write_report(report_df, str(output_dir / "report.jsonl"), "bench", "jsonl"),
+             report_rows),
+    ]
+
+
+def measure(case: Case, repeats: int) -> Dict[str, float]:
+    """
+    Замеряет время и пик памяти одного замера
+
+    Args:
+        case: Замер
+        repeats: Число запусков для медианы времени
+
+    Returns:
+        Словарь {"rows", "seconds", "rows_per_s", "peak_mb"}
+    """
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        case.func()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        "rows": case.rows,
+        "seconds": round(seconds, 6),
+        "rows_per_s": round(case.rows / seconds) if seconds > 0 else None,
+        "peak_mb": round(peak / 2 ** 20, 3),
+    }
+
+
+def run(sizes: List[str], repeats: int, cases: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    Выполняет замеры для указанных размеров выписки
+
+    Args:
+        sizes: Размеры из SIZES, например ['10k', '1m']
+        repeats: Число запусков каждого замера
+        cases: Имена замеров; если None, выполняются все
+
+    Returns:
+        Словарь {размер: {замер: результат measure}}
+    """
+    results: Dict[str, Dict[str, Dict]] = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            df = make_statement(SIZES[size], canonical=True)
+            store = TransactionStore(df)
+            results[size] = {}
+            for case in build_cases(df, store, Path(output_dir)):
+                if cases is None or case.name in cases:
+                    results[size][case.name] = measure(case, repeats)
+                    print_result(size, case.name, results[size][case.name])
+            del df, store
+            gc.collect()
+    return results
+
+
+def print_result(size: str, name: str, result: Dict[str, float]) -> None:
+    """Печатает строку таблицы результатов"""
+    print(f"{size:>4}  {name:<30}{result['seconds'] * 1000:>12.2f} мс{result['rows_per_s'] or 0:>16,} строк/с"
+          f"{result['peak_mb']:>12.2f} МБ", flush=True)
+
+
+def machine_info() -> Dict[str, Any]:
+    """Описание окружения, в котором получены замеры"""
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    """Читает базовые замеры; если файла нет, возвращает пустую структуру"""
+    if not path.exists():
+        return {"machine": None, "results": {}}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(results: Dict[str, Dict[str, Dict]], path: Path = BASELINE_PATH) -> None:
+    """Записывает замеры как базовые, сохраняя базовые значения других размеров"""
+    baseline = load_baseline(path)
+    baseline["machine"] = machine_info()
+    baseline["results"].update(results)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(results: Dict[str, Dict[str, Dict]],
+                     baseline: Dict[str, Dict[str, Dict]],
+                     time_tolerance: float = TIME_TOLERANCE,
+                     memory_tolerance: float = MEMORY_TOLERANCE) -> List[str]:
+    """
+    Сравнивает замеры с базовыми
+
+    Замеры, для которых нет базового значения, не проверяются.
+
+    Args:
+        results: Текущие замеры {размер: {замер: результат}}
+        baseline: Базовые замеры в том же формате
+        time_tolerance: Допустимое относительное увеличение времени
+        memory_tolerance: Допустимое относительное увеличение пика памяти
+
+    Returns:
+        Список описаний регрессий (пустой, если регрессий нет)
+    """
+    regressions = []
+    for size, cases in results.items():
+        for name, result in cases.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            if result["seconds"] > base["seconds"] * (1 + time_tolerance):
+                regressions.append(
+                    f"{size} {name}: время {result['seconds'] * 1000:.2f} мс, базовое {base['seconds'] * 1000:.2f} мс"
+                )
+            memory_limit = max(base["peak_mb"] * (1 + memory_tolerance), base["peak_mb"] + MEMORY_SLACK_MB)
+            if result["peak_mb"] > memory_limit:
+                regressions.append(
+                    f"{size} {name}: пик памяти {result['peak_mb']:.2f} МБ, базовый {base['peak_mb']:.2f} МБ"
+                )
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры скорости и памяти отчетов на синтетических выписках")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Размеры через запятую: {', '.join(SIZES)}")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--cases", help="Имена замеров через запятую (по умолчанию все)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="Завершиться с кодом 1 при регрессии")
+    parser.add_argument("--save-baseline", action="store_true", help="Записать замеры как базовые")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--output", type=Path, help="Файл для сохранения замеров в JSON")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes.split(",")
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"Неизвестные размеры: {', '.join(unknown)}")
+
+    logging.disable(logging.INFO)
+    results = run(sizes, args.repeats, args.cases.split(",") if args.cases else None)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"machine": machine_info(), "results": results}, file, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Базовые замеры записаны в {args.baseline}")
+
+    if args.check:
+        baseline = load_baseline(args.baseline)
+        if baseline["machine"] and baseline["machine"] != machine_info():
+            print(f"Внимание: базовые замеры получены в другом окружении: {baseline['machine']}")
+        regressions = find_regressions(results, baseline["results"], args.time_tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression}")
+        if regressions:
+            return 1
+        print("Регрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Генератор синтетических выписок в формате operations.xlsx
+
+Колонки и типы совпадают с выгрузкой банка: даты операций и платежей, номера карт
+(с пропусками), статус, суммы и валюты, кэшбэк, категория с MCC, описание, бонусы
+и округление на инвесткопилку. Значения повторяемы при одинаковом seed.
+
+При canonical=True возвращается DataFrame в каноническом виде (как после normalize_transactions)
+без промежуточных строк дат операций - так генерируются выборки на миллионы строк.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.transactions import CATEGORICAL_COLUMNS, DATE_FORMAT  # noqa: E402
+
+# Категории расходов: (категория, MCC, описания)
+EXPENSE_CATEGORIES = [
+    ("Супермаркеты", 5411, ["Колхоз", "Магнит", "Пятёрочка", "Перекрёсток", "Дикси"]),
+    ("Фастфуд", 5814, ["IP Yakubovskaya M. V.", "Mouse Tail", "Вкусно и точка", "Теремок"]),
+    ("Различные товары", 5399, ["Ozon.ru", "Wildberries", "Яндекс Маркет"]),
+    ("Каршеринг", 7512, ["Ситидрайв", "Яндекс Драйв", "Делимобиль"]),
+    ("Такси", 4121, ["Яндекс Такси", "Ситимобил"]),
+    ("Аптеки", 5912, ["Ригла", "Планета Здоровья", "Горздрав"]),
+    ("Медицина", 8099, ["Eurooptica", "Инвитро", "Гемотест"]),
+    ("Рестораны", 5812, ["Пхали-Хинкали", "Шоколадница", "Кофемания"]),
+    ("Транспорт", 4111, ["Метро Санкт-Петербург", "Мосгортранс"]),
+    ("Одежда и обувь", 5651, ["ZARA", "Спортмастер", "Глория Джинс"]),
+    ("Связь", 4814, ["МТС", "Билайн", "Тинькофф Мобайл"]),
+    ("Развлечения", 7832, ["Кинотеатр Москва", "Синема Парк"]),
+    ("Дом и ремонт", 5200, ["Леруа Мерлен", "OBI", "Петрович"]),
+    ("Топливо", 5541, ["Лукойл", "Роснефть", "Газпромнефть"]),
+    ("Переводы", None, ["Перевод Иванову И.", "Перевод Петрову П."]),
+]
+INCOME_CATEGORIES = [
+    ("Пополнения", None, ["Пополнение через Газпромбанк", "Внесение наличных"]),
+    ("Бонусы", None, ["Кэшбэк за обычные покупки"]),
+]
+CATEGORIES = [category for category, _, _ in EXPENSE_CATEGORIES]
+
+CARDS = ["*7197", "*5091", "*4556", "*1112", "*5507", "*6002", "*5441"]
+
+# Доли операций: пополнения, без номера карты, неуспешные
+INCOME_SHARE = 0.05
+NO_CARD_SHARE = 0.1
+FAILED_SHARE = 0.02
+
+COLUMNS = [
+    "Дата операции", "Дата платежа", "Номер карты", "Статус", "Сумма операции", "Валюта операции",
+    "Сумма платежа", "Валюта платежа", "Кэшбэк", "Категория", "MCC", "Описание",
+    "Бонусы (включая кэшбэк)", "Округление на инвесткопилку", "Сумма операции с округлением",
+]
+
+
+def make_statement(rows: int,
+                   seed: int = 0,
+                   start: str = "2019-01-01",
+                   days: int = 3 * 365,
+                   canonical: bool = False) -> pd.DataFrame:
+    """
+    Создает синтетическую выписку
+
+    Args:
+        rows: Число операций
+        seed: Начальное значение генератора случайных чисел
+        start: Дата первой возможной операции
+        days: Длина периода в днях
+        canonical: Вернуть DataFrame в каноническом виде вместо формата выгрузки
+
+    Returns:
+        DataFrame с колонками COLUMNS; операции упорядочены по убыванию даты, как в выгрузке
+    """
+    rng = np.random.default_rng(seed)
+
+    seconds = np.sort(rng.integers(0, days * 86400, rows))[::-1]
+    dates = (pd.Timestamp(start).to_datetime64() + seconds.astype("timedelta64[s]")).astype("datetime64[ns]")
+
+    # Категория выбирается по индексу в общем списке: сначала расходные, затем доходные
+    categories = EXPENSE_CATEGORIES + INCOME_CATEGORIES
+    is_income = rng.random(rows) < INCOME_SHARE
+    category_index = np.where(
+        is_income,
+        len(EXPENSE_CATEGORIES) + rng.integers(0, len(INCOME_CATEGORIES), rows),
+        rng.integers(0, len(EXPENSE_CATEGORIES), rows),
+    )
+
+    # Описание - одно из описаний категории; строки общие, а не копии на каждую операцию
+    descriptions = np.empty(rows, dtype=object)
+    for index, (_, _, names) in enumerate(categories):
+        selected = np.flatnonzero(category_index == index)
+        descriptions[selected] = np.asarray(names, dtype=object)[rng.integers(0, len(names), len(selected))]
+
+    expenses = -np.round(rng.lognormal(6, 1.2, rows), 2)
+    incomes = np.round(rng.lognormal(9, 0.8, rows), 2)
+    amounts = np.where(is_income, incomes, expenses)
+
+    cards = np.asarray(CARDS, dtype=object)[rng.integers(0, len(CARDS), rows)]
+    cards[rng.random(rows) < NO_CARD_SHARE] = np.nan
+
+    statuses = np.where(rng.random(rows) < FAILED_SHARE, "FAILED", "OK").astype(object)
+    mcc = np.array([np.nan if code is None else code for _, code, _ in categories], dtype=np.float64)
+
+    # Дата платежа - день операции; строки берутся из списка уникальных дней
+    day_index = seconds // 86400
+    day_strings = (pd.Timestamp(start) + pd.to_timedelta(np.arange(days + 1), unit="D")).strftime("%d.%m.%Y")
+    payment_dates = np.asarray(day_strings, dtype=object)[day_index]
+
+    rounded = np.where(amounts < 0, np.ceil(-amounts / 10) * 10, np.abs(amounts))
+    df = pd.DataFrame({
+        "Дата операции": dates,
+        "Дата платежа": payment_dates,
+        "Номер карты": cards,
+        "Статус": statuses,
+        "Сумма операции": amounts,
+        "Валюта операции": "RUB",
+        "Сумма платежа": amounts,
+        "Валюта платежа": "RUB",
+        "Кэшбэк": np.full(rows, np.nan),
+        "Категория": np.asarray([category for category, _, _ in categories], dtype=object)[category_index],
+        "MCC": mcc[category_index],
+        "Описание": descriptions,
+        "Бонусы (включая кэшбэк)": np.where(amounts < 0, (-amounts // 100).astype(np.int64), 0),
+        "Округление на инвесткопилку": 0,
+        "Сумма операции с округлением": rounded,
+    }, columns=COLUMNS)
+
+    if canonical:
+        for column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype("category")
+    else:
+        df["Дата операции"] = df["Дата операции"].dt.strftime(DATE_FORMAT)
+    return df
@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.loader import CACHE_DIR, DATA_DIR, load_statements  # noqa: E402
+from src.quote_cache import QuoteCache  # noqa: E402
+from src.transactions import TransactionStore  # noqa: E402
+from src.views import create_summary_json, get_currency_rates, get_stock_prices, set_quote_cache  # noqa: E402
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SUMMARY_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Число частей на процесс при раздаче запросов пулу: баланс нагрузки против накладных расходов
+BATCH_CHUNKS_PER_WORKER = 4
+
+# Состояние процесса пула: хранилище и котировки передаются один раз при запуске процесса
+_worker_state: Dict[str, Any] = {}
+
+
+def read_requests(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Разбирает запросы пакетного расчета
+
+    Каждая непустая строка - JSON-объект с ключом "date" (остальные ключи, например "id",
+    переносятся в результат без изменений) или просто дата в формате 'YYYY-MM-DD HH:MM:SS'.
+
+    Args:
+        lines: Строки файла запросов
+
+    Returns:
+        Список запросов-словарей
+    """
+    requests = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            request = json.loads(line)
+            if "date" not in request:
+                raise ValueError(f"Строка {number}: в запросе нет ключа 'date'")
+            requests.append(request)
+        else:
+            requests.append({"date": line})
+    return requests
+
+
+def _summarize(store: TransactionStore,
+               request: Dict[str, Any],
+               currency_rates: Dict[str, float],
+               stock_prices: List[Dict]) -> Dict[str, Any]:
+    """Считает сводку по одному запросу; неверная дата дает запись с ключом "error" вместо сводки"""
+    result = dict(request)
+    try:
+        datetime.strptime(request["date"], SUMMARY_DATE_FORMAT)
+    except (TypeError, ValueError):
+        result["error"] = f"Неверный формат даты: {request['date']}. Ожидается 'YYYY-MM-DD HH:MM:SS'"
+        return result
+
+    result["summary"] = create_summary_json(store, request["date"], currency_rates, stock_prices)
+    return result
+
+
+def _init_worker(store: TransactionStore, currency_rates: Dict[str, float], stock_prices: List[Dict]) -> None:
+    """Сохраняет общее состояние в процессе пула"""
+    _worker_state.update(store=store, currency_rates=currency_rates, stock_prices=stock_prices)
+
+
+def _worker_summarize(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Считает сводку в процессе пула по состоянию из _init_worker"""
+    return _summarize(_worker_state["store"], request,
+                      _worker_state["currency_rates"], _worker_state["stock_prices"])
+
+
+def fetch_quotes() -> tuple:
+    """
+    Получает курсы валют и цены акций один раз для всего пакета
+
+    Returns:
+        Кортеж (курсы валют, цены акций); при ошибке раздел пустой
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        currency_future = executor.submit(get_currency_rates)
+        stocks_future = executor.submit(get_stock_prices)
+
+    try:
+        currency_rates = currency_future.result()
+    except Exception as e:
+        logger.error(f"Ошибка при получении курсов валют: {e}")
+        currency_rates = {}
+    try:
+        stock_prices = stocks_future.result()
+    except Exception as e:
+        logger.error(f"Ошибка при получении цен на акции: {e}")
+        stock_prices = []
+    return currency_rates, stock_prices
+
+
+def summarize_batch(store: TransactionStore,
+                    requests: List[Dict[str, Any]],
+                    max_workers: int = 1,
+                    currency_rates: Optional[Dict[str, float]] = None,
+                    stock_prices: Optional[List[Dict]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Считает сводки create_summary_json для множества дат в одном процессе
+
+    Все запросы используют одно хранилище операций (окна выбираются по индексу дат)
+    и одни котировки, полученные один раз на весь пакет.
+
+    Args:
+        store: Отсортированное хранилище операций
+        requests: Запросы (словари с ключом "date")
+        max_workers: Число процессов; при 1 сводки считаются в текущем процессе
+        currency_rates: Курсы валют; если None, запрашиваются один раз
+        stock_prices: Цены акций; если None, запрашиваются один раз
+
+    Returns:
+        Итератор результатов в порядке запросов: запрос, дополненный ключом "summary" или "error"
+    """
+    if currency_rates is None or stock_prices is None:
+        fetched_rates, fetched_prices = fetch_quotes()
+        currency_rates = fetched_rates if currency_rates is None else currency_rates
+        stock_prices = fetched_prices if stock_prices is None else stock_prices
+
+    if max_workers > 1 and len(requests) > 1:
+        chunksize = max(1, len(requests) // (max_workers * BATCH_CHUNKS_PER_WORKER))
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(store, currency_rates, stock_prices)) as executor:
+            yield from executor.map(_worker_summarize, requests, chunksize=chunksize)
+    else:
+        for request in requests:
+            yield _summarize(store, request, currency_rates, stock_prices)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], output: TextIO) -> int:
+    """
+    Записывает результаты в формате JSON Lines по мере готовности
+
+    Args:
+        records: Результаты пакетного расчета
+        output: Открытый текстовый поток
+
+    Returns:
+        Число записанных строк
+    """
+    count = 0
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False))
+        output.write("\n")
+        count += 1
+    return count
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Считает сводки для дат из аргументов или файла запросов и выводит их в JSON Lines"""
+    parser = argparse.ArgumentParser(description="Пакетный расчет сводок по банковским операциям")
+    parser.add_argument("--date", action="append", default=[],
+                        help="Дата сводки 'YYYY-MM-DD HH:MM:SS' (можно указать несколько раз)")
+    parser.add_argument("--requests", type=Path,
+                        help="Файл запросов: JSON Lines с ключом 'date' или по одной дате в строке")
+    parser.add_argument("--output", type=Path, help="Файл результата (по умолчанию stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Число процессов")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--offline", action="store_true", help="Не запрашивать курсы валют и цены акций")
+    args = parser.parse_args(argv)
+
+    requests = [{"date": date} for date in args.date]
+    if args.requests:
+        with open(args.requests, encoding="utf-8") as file:
+            requests.extend(read_requests(file))
+    if not requests:
+        parser.error("Укажите --date или --requests")
+
+    df, load_report = load_statements(args.data_dir)
+    for file_report in load_report:
+        if file_report["error"]:
+            logger.error(f"Ошибка загрузки {file_report['path']}: {file_report['error']}")
+    store = TransactionStore(df)
+
+    if args.offline:
+        quotes = ({}, [])
+    else:
+        set_quote_cache(QuoteCache(persist_path=CACHE_DIR / "quotes.json"))
+        quotes = fetch_quotes()
+
+    records = summarize_batch(store, requests, args.workers, *quotes)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            count = write_jsonl(records, output)
+    else:
+        count = write_jsonl(records, sys.stdout)
+    logger.info(f"Рассчитано сводок: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Коды ответа, при которых запрос стоит повторить
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов по алгоритму "корзина токенов"
+
+    Токены пополняются со скоростью rate в секунду до capacity;
+    каждый запрос забирает один токен или ждет его появления.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Скорость пополнения токенов в секунду
+            capacity: Максимальное число накопленных токенов (размер всплеска), не меньше 1
+
+        Raises:
+            ValueError: если rate не положительна или capacity меньше 1 - токен не был бы получен никогда
+        """
+        if rate <= 0:
+            raise ValueError(f"Скорость пополнения токенов должна быть положительной: {rate}")
+        if capacity < 1:
+            raise ValueError(f"Размер корзины токенов должен быть не меньше 1: {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Забирает один токен, при необходимости ожидая его появления
+
+        Args:
+            timeout: Максимальное время ожидания в секундах. Если None, ждет без ограничения
+
+        Returns:
+            True, если токен получен, False, если время ожидания истекло
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class RequestCoalescer:
+    """
+    Объединяет одинаковые одновременные запросы
+
+    Пока запрос с данным ключом выполняется, остальные вызовы с тем же ключом
+    не отправляют новый запрос, а ждут и получают его результат.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Выполняет func или присоединяется к уже выполняющемуся вызову с тем же ключом
+
+        Args:
+            key: Ключ запроса (например, URL)
+            func: Функция, выполняющая запрос
+
+        Returns:
+            Результат func
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+def _retry_delay(response: Optional[requests.Response], attempt: int, backoff: float, max_delay: float) -> float:
+    """
+    Возвращает паузу перед повтором: Retry-After из ответа или экспоненциальную задержку,
+    но не больше max_delay - сервер может прислать Retry-After в минуты и часы
+    """
+    delay = backoff * 2 ** attempt
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if isinstance(retry_after, (str, int, float)):
+            try:
+                delay = max(0.0, float(retry_after))
+            except ValueError:
+                pass
+    return min(delay, max_delay)
+
+
+def get_with_retry(session: requests.Session,
+                   url: str,
+                   timeout: float,
+                   limiter: Optional[TokenBucket] = None,
+                   retries: int = 2,
+                   backoff: float = 0.5) -> requests.Response:
+    """
+    Выполняет GET-запрос с ограничением частоты и повторами
+
+    Запрос повторяется при ошибке соединения и кодах ответа из RETRY_STATUS_CODES
+    с экспоненциальной задержкой (или задержкой из заголовка Retry-After);
+    пауза перед повтором не превышает timeout.
+
+    Args:
+        session: HTTP-сессия
+        url: Адрес запроса
+        timeout: Таймаут запроса и ожидания токена в секундах
+        limiter: Ограничитель частоты запросов
+        retries: Число повторов после первой попытки
+        backoff: Базовая задержка между повторами в секундах
+
+    Returns:
+        Ответ последней попытки
+
+    Raises:
+        requests.exceptions.Timeout: если не удалось дождаться токена ограничителя
+        requests.exceptions.RequestException: если все попытки завершились ошибкой соединения
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None and not limiter.acquire(timeout=timeout):
+            raise requests.exceptions.Timeout("Превышено время ожидания лимита запросов")
+
+        try:
+            response = session.get(url, timeout=timeout)
+        except requests.exceptions.ConnectionError:
+            if attempt == retries:
+                raise
+            response = None
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                return response
+
+        delay = _retry_delay(response, attempt, backoff, max_delay=timeout)
+        logger.warning(f"Повтор запроса через {delay:.2f} с (попытка {attempt + 2} из {retries + 1})")
+        time.sleep(delay)
+
+    raise AssertionError("unreachable")
@@ -0,0 +1,430 @@
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from src.transactions import TransactionStore, normalize_transactions
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Пути к данным
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+OPERATIONS_FILE_PATH = DATA_DIR / "operations.xlsx"
+CACHE_DIR = DATA_DIR / ".cache"
+ARCHIVE_DIR = CACHE_DIR / "archive"
+
+OPERATIONS_SHEET_NAME = "Отчет по операциям"
+
+# Число строк в одной части при потоковом чтении выгрузки
+OPERATIONS_CHUNK_SIZE = 50_000
+
+# Шаблон файлов выписок и максимальное число процессов для их разбора
+STATEMENT_FILE_PATTERN = "*.xlsx"
+STATEMENTS_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Колонки пустого архива операций
+_EMPTY_COLUMNS = ("Дата операции", "Номер карты", "Сумма операции", "Категория", "Описание")
+
+# Версия формата кэша: при изменении структуры .npz старые файлы перестают подходить
+CACHE_FORMAT_VERSION = 1
+
+
+def _cache_key(source_path: Path, sheet_name: str) -> str:
+    """
+    Формирует ключ кэша по метаданным исходного файла
+
+    Args:
+        source_path: Путь к Excel-файлу
+        sheet_name: Имя листа
+
+    Returns:
+        Хэш от размера, времени изменения файла, имени листа и версии формата
+    """
+    stat = source_path.stat()
+    raw_key = f"{CACHE_FORMAT_VERSION}:{source_path.resolve()}:{sheet_name}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_prefix(source_path: Path) -> str:
+    """
+    Возвращает префикс имен файлов кэша для исходного файла
+
+    Кроме имени файла префикс содержит хэш полного пути: выписки с одинаковыми именами
+    в разных директориях (account_1/2021-12.xlsx и account_2/2021-12.xlsx) не делят кэш.
+    """
+    path_hash = hashlib.sha1(str(source_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return f"{source_path.stem}.{path_hash}"
+
+
+def _cache_path(source_path: Path, sheet_name: str, cache_dir: Path) -> Path:
+    """Возвращает путь к файлу кэша для исходного файла"""
+    return cache_dir / f"{_cache_prefix(source_path)}.{_cache_key(source_path, sheet_name)}.npz"
+
+
+def write_cache(df: pd.DataFrame, cache_path: Path) -> bool:
+    """
+    Сохраняет DataFrame в колоночный кэш формата .npz
+
+    Числовые колонки и даты datetime64 без часового пояса сохраняются как есть,
+    строковые - как массив unicode-строк с отдельной маской пропусков,
+    категориальные со строковыми категориями - как коды и список категорий.
+    Колонки с другими типами не поддерживаются.
+
+    Args:
+        df: DataFrame для сохранения
+        cache_path: Путь к файлу кэша
+
+    Returns:
+        True, если кэш записан, иначе False
+    """
+    arrays = {"__columns__": np.asarray(df.columns.astype(str), dtype=str)}
+    kinds = []
+
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) and \
+                pd.api.types.infer_dtype(series.cat.categories, skipna=True) in ("string", "empty"):
+            arrays[f"c{i}"] = series.cat.codes.to_numpy()
+            arrays[f"k{i}"] = np.asarray(series.cat.categories, dtype=str)
+            kinds.append("C")
+        elif series.dtype.kind in "biuf" or (
+            series.dtype.kind == "M" and not isinstance(series.dtype, pd.DatetimeTZDtype)
+        ):
+            arrays[f"c{i}"] = series.to_numpy()
+            kinds.append(series.dtype.kind)
+        elif series.dtype.kind == "O" and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            mask = series.isna().to_numpy()
+            arrays[f"c{i}"] = np.asarray(series.where(~mask, "").to_numpy(), dtype=str)
+            arrays[f"m{i}"] = mask
+            kinds.append("O")
+        else:
+            logger.warning(f"Колонка '{column}' с типом {series.dtype} не поддерживается кэшем")
+            return False
+    arrays["__kinds__"] = np.asarray(kinds, dtype=str)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    # Атомарная замена: параллельный читатель никогда не увидит недописанный файл
+    os.replace(tmp_path, cache_path)
+    return True
+
+
+def read_cache(cache_path: Path) -> pd.DataFrame:
+    """
+    Читает DataFrame из колоночного кэша формата .npz
+
+    Args:
+        cache_path: Путь к файлу кэша
+
+    Returns:
+        DataFrame с исходными колонками и типами
+    """
+    with np.load(cache_path, allow_pickle=False) as npz:
+        columns = list(npz["__columns__"])
+        kinds = list(npz["__kinds__"])
+        data = {}
+        for i, (column, kind) in enumerate(zip(columns, kinds)):
+            values = npz[f"c{i}"]
+            if kind == "O":
+                values = values.astype(object)
+                values[npz[f"m{i}"]] = np.nan
+            elif kind == "C":
+                values = pd.Categorical.from_codes(values, categories=npz[f"k{i}"].astype(object))
+            data[column] = values
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def _remove_stale_caches(source_path: Path, cache_dir: Path, keep: Path) -> None:
+    """Удаляет устаревшие файлы кэша для исходного файла (того же пути, а не только имени)"""
+    for stale in cache_dir.glob(f"{_cache_prefix(source_path)}.*.npz"):
+        if stale != keep:
+            try:
+                stale.unlink()
+            except OSError as e:
+                logger.warning(f"Не удалось удалить устаревший кэш {stale}: {e}")
+
+
+def load_operations(
+    path: Path | str = OPERATIONS_FILE_PATH,
+    sheet_name: str = OPERATIONS_SHEET_NAME,
+    cache_dir: Optional[Path | str] = CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Загружает операции из Excel-файла, используя колоночный кэш
+
+    При первом чтении лист разбирается через pd.read_excel и сохраняется в .npz.
+    Последующие загрузки читают кэш, пока не изменятся размер или время изменения файла.
+
+    Args:
+        path: Путь к Excel-файлу с операциями
+        sheet_name: Имя листа с операциями
+        cache_dir: Директория для файлов кэша. Если None, кэш не используется
+
+    Returns:
+        DataFrame с операциями
+    """
+    source_path = Path(path)
+
+    if cache_dir is None:
+        return pd.read_excel(source_path, sheet_name=sheet_name)
+
+    cache_dir = Path(cache_dir)
+    cache_path = _cache_path(source_path, sheet_name, cache_dir)
+
+    if cache_path.exists():
+        try:
+            df = read_cache(cache_path)
+            logger.info(f"Операции загружены из кэша: {cache_path}")
+            return df
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать кэш {cache_path}: {e}")
+
+    df = pd.read_excel(source_path, sheet_name=sheet_name)
+
+    try:
+        if write_cache(df, cache_path):
+            _remove_stale_caches(source_path, cache_dir, keep=cache_path)
+            logger.info(f"Кэш операций сохранен: {cache_path}")
+    except OSError as e:
+        logger.warning(f"Не удалось сохранить кэш {cache_path}: {e}")
+
+    return df
+
+
+def discover_statement_files(root: Path | str = DATA_DIR) -> List[Path]:
+    """
+    Находит файлы выписок в директории и ее поддиректориях
+
+    Скрытые директории (например, кэш) и временные файлы Excel ('~$...') пропускаются.
+
+    Args:
+        root: Корневая директория с выписками
+
+    Returns:
+        Отсортированный список путей к файлам
+    """
+    root = Path(root)
+    return sorted(
+        path for path in root.rglob(STATEMENT_FILE_PATTERN)
+        if not path.name.startswith("~$")
+        and not any(part.startswith(".") for part in path.relative_to(root).parts[:-1])
+    )
+
+
+def _load_statement(path: Path,
+                    sheet_name: str,
+                    cache_dir: Optional[Path]) -> Tuple[Optional[pd.DataFrame], float, Optional[str]]:
+    """
+    Загружает одну выписку (выполняется в отдельном процессе)
+
+    Returns:
+        Кортеж (DataFrame или None при ошибке, время загрузки в секундах, текст ошибки)
+    """
+    started = time.perf_counter()
+    try:
+        df = load_operations(path, sheet_name=sheet_name, cache_dir=cache_dir)
+        return df, time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+def load_statements(
+    root: Path | str = DATA_DIR,
+    sheet_name: str = OPERATIONS_SHEET_NAME,
+    cache_dir: Optional[Path | str] = CACHE_DIR,
+    max_workers: int = STATEMENTS_MAX_WORKERS,
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Загружает все выписки из директории и объединяет их в один канонический DataFrame
+
+    Файлы разбираются параллельно в пуле процессов (разбор Excel ограничен GIL),
+    каждый процесс использует колоночный кэш load_operations.
+    Ошибка в одном файле не прерывает загрузку остальных.
+
+    Args:
+        root: Корневая директория с выписками
+        sheet_name: Имя листа с операциями
+        cache_dir: Директория для файлов кэша. Если None, кэш не используется
+        max_workers: Максимальное число процессов. При 1 файлы загружаются в текущем процессе
+
+    Returns:
+        Кортеж (DataFrame с операциями всех файлов в каноническом виде,
+        список словарей {"path", "rows", "seconds", "error"} по каждому файлу)
+
+    Raises:
+        FileNotFoundError: если в директории нет файлов выписок
+    """
+    files = discover_statement_files(root)
+    if not files:
+        raise FileNotFoundError(f"Файлы выписок не найдены в {root}")
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else None
+    arguments = (files, [sheet_name] * len(files), [cache_dir] * len(files))
+
+    if max_workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            results = list(executor.map(_load_statement, *arguments))
+    else:
+        results = list(map(_load_statement, *arguments))
+
+    frames = []
+    report = []
+    for path, (df, seconds, error) in zip(files, results):
+        if error is None:
+            frames.append(df)
+            logger.info(f"Выписка {path} загружена за {seconds:.2f} с: {len(df)} операций")
+        else:
+            logger.error(f"Не удалось загрузить выписку {path}: {error}")
+        report.append({"path": str(path), "rows": 0 if df is None else len(df), "seconds": seconds, "error": error})
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(_EMPTY_COLUMNS))
+    return normalize_transactions(df), report
+
+
+def iter_operations_chunks(
+    path: Path | str = OPERATIONS_FILE_PATH,
+    sheet_name: str = OPERATIONS_SHEET_NAME,
+    chunk_size: int = OPERATIONS_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Потоково читает операции из Excel-файла частями
+
+    Лист читается openpyxl в режиме read_only построчно, поэтому в памяти одновременно
+    находится не больше chunk_size строк. Каждая часть приводится к каноническому виду
+    (normalize_transactions); категории в разных частях могут различаться.
+
+    Args:
+        path: Путь к Excel-файлу с операциями
+        sheet_name: Имя листа с операциями
+        chunk_size: Число строк в одной части
+
+    Yields:
+        DataFrame с очередной частью операций
+    """
+    workbook = load_workbook(Path(path), read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = list(header)
+        buffer = []
+        for row in rows:
+            # В режиме read_only в конце листа могут встречаться пустые строки
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield normalize_transactions(pd.DataFrame.from_records(buffer, columns=columns))
+                buffer = []
+
+        if buffer:
+            yield normalize_transactions(pd.DataFrame.from_records(buffer, columns=columns))
+    finally:
+        workbook.close()
+
+
+class OperationsArchive:
+    """
+    Накопительный архив операций из последовательных выгрузок
+
+    Архив хранится как набор сегментов .npz (формат write_cache): каждый вызов ingest
+    дописывает новый сегмент только с операциями, которых еще не было в архиве.
+    Запись на диск, агрегаты и ключи повторов обновляются по новым строкам; данные хранилища
+    в памяти пересобираются с копированием всей истории (см. TransactionStore.append).
+    """
+
+    def __init__(self, directory: Path | str = ARCHIVE_DIR):
+        """
+        Args:
+            directory: Директория с сегментами архива
+        """
+        self.directory = Path(directory)
+        self._store: Optional[TransactionStore] = None
+
+    @property
+    def segments(self) -> list:
+        """Файлы сегментов в порядке добавления"""
+        return sorted(self.directory.glob("segment_*.npz"))
+
+    @property
+    def store(self) -> TransactionStore:
+        """Хранилище всех операций архива (загружается при первом обращении)"""
+        if self._store is None:
+            self._store = self._load_store()
+        return self._store
+
+    def _load_store(self) -> TransactionStore:
+        """Читает все сегменты и строит хранилище операций"""
+        frames = []
+        for segment in self.segments:
+            try:
+                # Сегменты могут быть в формате выгрузки или в каноническом виде: приводим к одному
+                frames.append(normalize_transactions(read_cache(segment)))
+            except Exception as e:
+                logger.warning(f"Не удалось прочитать сегмент архива {segment}: {e}")
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(_EMPTY_COLUMNS))
+        logger.info(f"Архив операций загружен: {len(df)} операций из {len(frames)} сегментов")
+        return TransactionStore(normalize_transactions(df))
+
+    def ingest(self, path: Path | str, sheet_name: str = OPERATIONS_SHEET_NAME) -> int:
+        """
+        Добавляет в архив операции из новой выгрузки
+
+        Args:
+            path: Путь к Excel-файлу с операциями
+            sheet_name: Имя листа с операциями
+
+        Returns:
+            Число добавленных операций
+        """
+        df = pd.read_excel(Path(path), sheet_name=sheet_name)
+        return self.ingest_frame(df)
+
+    def ingest_frame(self, df: pd.DataFrame) -> int:
+        """
+        Добавляет в архив операции из DataFrame в формате выгрузки или в каноническом виде
+
+        Сначала новые операции записываются в сегмент, и только после успешной записи
+        добавляются в хранилище: операция не может считаться загруженной, если ее нет на диске.
+
+        Args:
+            df: DataFrame с операциями
+
+        Returns:
+            Число добавленных операций
+
+        Raises:
+            ValueError: если колонки нельзя сохранить в сегмент (см. write_cache)
+            OSError: если сегмент не удалось записать
+        """
+        added = df[self.store.new_rows(df)].reset_index(drop=True)
+        if added.empty:
+            return 0
+
+        segments = self.segments
+        number = int(segments[-1].stem.split("_")[-1]) + 1 if segments else 1
+        segment_path = self.directory / f"segment_{number:06d}.npz"
+
+        if not write_cache(added, segment_path):
+            raise ValueError(f"Сегмент архива {segment_path} не сохранен: типы колонок не поддерживаются")
+        logger.info(f"Сегмент архива сохранен: {segment_path} ({len(added)} операций)")
+
+        self.store.append(added)
+        return len(added)
@@ -1,50 +1,124 @@
+import argparse
+import importlib
 import json
-import os
+import sys
 from pathlib import Path
 import logging
-from views import *
-from services import investment_bank
-from reports import *
 
-if __name__ == "__main__":
-    # Определяем путь к корневой директории проекта
-    PROJECT_ROOT = Path(__file__).parent.parent
-    DATA_DIR = PROJECT_ROOT / "data"
-    OPERATIONS_FILE_PATH = DATA_DIR / "operations.xlsx"
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pandas, requests и модули отчетов импортируются внутри команд: справка и settings
+# выводятся сразу, без загрузки тяжелых библиотек и чтения .env
+
+# Команды, реализованные в отдельных модулях: им передаются оставшиеся аргументы
+DELEGATED_COMMANDS = {
+    "serve": "src.server",
+    "batch": "src.batch",
+}
+
+SUMMARY_DATE = '2021-12-31 23:59:59'
 
-    # Настройка логирования
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
 
-    # Загрузка данных из Excel
+def run_demo() -> None:
+    """Загружает выписки и выводит примеры всех отчетов"""
+    from src.loader import CACHE_DIR, DATA_DIR, load_statements
+    from src.quote_cache import QuoteCache
+    from src.report_queue import BackgroundReportWriter
+    from src.reports import set_report_queue, spending_by_categories, spending_by_category
+    from src.services import investment_bank_df
+    from src.transactions import TransactionStore
+    from src.views import create_summary_json, set_quote_cache
+
+    # Кэш курсов валют и котировок сохраняется между запусками
+    set_quote_cache(QuoteCache(persist_path=CACHE_DIR / "quotes.json"))
+
+    # Отчеты записываются в фоне и не задерживают расчеты
+    report_queue = BackgroundReportWriter()
+    set_report_queue(report_queue)
+
+    # Загрузка всех выписок из data (параллельно; повторные запуски читают колоночный кэш)
     try:
-        df = pd.read_excel(OPERATIONS_FILE_PATH, sheet_name='Отчет по операциям')
+        # Операции всех файлов сразу приводятся к каноническому виду
+        df, load_report = load_statements(DATA_DIR)
+        for file_report in load_report:
+            if file_report["error"]:
+                print(f"Ошибка загрузки {file_report['path']}: {file_report['error']}")
+
+        # Хранилище, отсортированное по дате, для быстрого выбора окон
+        store = TransactionStore(df)
 
         # Использование функции без указания даты (используется текущая дата)
-        result = spending_by_category(df, 'Супермаркеты')
+        result = spending_by_category(store, 'Супермаркеты')
         print(f"Найдено транзакций: {len(result)}")
 
         # Использование функции с указанием даты
-        result_with_date = spending_by_category(df, 'Супермаркеты', date='31.12.2021')
+        result_with_date = spending_by_category(store, 'Супермаркеты', date='31.12.2021')
         print(f"Найдено транзакций с указанной датой: {len(result_with_date)}")
 
-        transactions = df[['Дата операции', 'Сумма операции']].to_dict('records')
+        # Расходы по всем категориям за один проход
+        categories_result = spending_by_categories(store, date='31.12.2021')
+        print(f"Категорий с расходами: {len(categories_result)}")
 
         # Пример параметров для функции
         month = '2021-12'  # месяц в формате YYYY-MM
         limit = 10  # лимит округления
 
-        # Вызов функции investment_bank
-        investment_result = investment_bank(month, transactions, limit)
+        # Вызов векторизованной функции investment_bank по DataFrame
+        investment_result = investment_bank_df(month, df, limit)
         print(f"\nРезультат работы investment_bank: {investment_result:.2f} ₽")
 
         # Тестовый вызов
-        test_date = '2021-12-31 23:59:59'
-        response = create_summary_json(df, test_date)
+        response = create_summary_json(store, SUMMARY_DATE)
 
         print(json.dumps(response, ensure_ascii=False, indent=2))
 
-    except FileNotFoundError:
-        print(f"Файл не найден: {OPERATIONS_FILE_PATH}")
+    except FileNotFoundError as e:
+        print(e)
     except Exception as e:
-        print(f"Ошибка: {e}")
\ No newline at end of file
+        print(f"Ошибка: {e}")
+    finally:
+        # Дожидаемся записи всех отчетов перед выходом
+        report_queue.close()
+
+
+def show_settings() -> None:
+    """Выводит пользовательские настройки (без pandas и сетевых запросов)"""
+    from src.settings import USER_SETTINGS_PATH, load_user_settings
+
+    print(f"Файл настроек: {USER_SETTINGS_PATH}")
+    print(json.dumps(load_user_settings(), ensure_ascii=False, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создает разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Анализ банковских операций")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("demo", help="Примеры всех отчетов по выпискам из data (по умолчанию)")
+    commands.add_parser("settings", help="Показать пользовательские настройки")
+    commands.add_parser("serve", help="HTTP-сервер отчетов (аргументы: src/server.py --help)")
+    commands.add_parser("batch", help="Пакетный расчет сводок (аргументы: src/batch.py --help)")
+    return parser
+
+
+def main(argv: list | None = None) -> None:
+    """Точка входа: разбирает команду и импортирует только нужные ей модули"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] in DELEGATED_COMMANDS:
+        importlib.import_module(DELEGATED_COMMANDS[argv[0]]).main(argv[1:])
+        return
+
+    args = build_parser().parse_args(argv)
+    if args.command == "settings":
+        show_settings()
+    else:
+        run_demo()
+
+
+if __name__ == "__main__":
+    # Настройка логирования
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+    main()
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    """
+    Кэш котировок и курсов валют с временем жизни записей
+
+    Свежие значения (моложе ttl) отдаются сразу. Устаревшие, но моложе stale_ttl,
+    тоже отдаются сразу, а обновление запускается в фоне. Если запрос к API
+    не удался, возвращается последнее известное значение.
+    Записи вытесняются по принципу LRU и при необходимости сохраняются в JSON-файл.
+    """
+
+    def __init__(self,
+                 ttl: float = 300,
+                 stale_ttl: float = 3600,
+                 max_entries: int = 256,
+                 persist_path: Optional[Path | str] = None):
+        """
+        Args:
+            ttl: Время в секундах, в течение которого значение считается свежим
+            stale_ttl: Время в секундах, в течение которого устаревшее значение отдается с фоновым обновлением
+            max_entries: Максимальное число записей в кэше
+            persist_path: Путь к JSON-файлу для сохранения кэша между запусками. Если None, кэш только в памяти
+        """
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+        if self.persist_path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Возвращает последнее известное значение независимо от его возраста
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Значение или None, если записи нет
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["value"] if entry else None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохраняет значение в кэш
+
+        Args:
+            key: Ключ записи
+            value: Значение (должно сериализоваться в JSON при включенном сохранении)
+        """
+        with self._lock:
+            self._entries[key] = {"value": value, "fetched_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if self.persist_path:
+            self._save()
+
+    def get_or_fetch(self,
+                     key: str,
+                     fetch: Callable[[], Any],
+                     is_valid: Callable[[Any], bool] = bool) -> Any:
+        """
+        Возвращает значение из кэша или получает его через fetch
+
+        Args:
+            key: Ключ записи
+            fetch: Функция получения значения из API
+            is_valid: Проверка, что полученное значение можно сохранить в кэш
+
+        Returns:
+            Свежее, устаревшее (с фоновым обновлением) или только что полученное значение
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+
+        if entry:
+            age = time.time() - entry["fetched_at"]
+            if age <= self.ttl:
+                return entry["value"]
+            if age <= self.stale_ttl:
+                self._refresh_in_background(key, fetch, is_valid)
+                return entry["value"]
+
+        value = fetch()
+        if is_valid(value):
+            self.set(key, value)
+            return value
+
+        if entry:
+            logger.warning(f"Не удалось обновить '{key}', используется последнее известное значение")
+            return entry["value"]
+
+        return value
+
+    def wait_refreshes(self, timeout: Optional[float] = None) -> None:
+        """
+        Ожидает завершения фоновых обновлений
+
+        Args:
+            timeout: Максимальное время ожидания каждого обновления в секундах
+        """
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any], is_valid: Callable[[Any], bool]) -> None:
+        """Запускает фоновое обновление записи, если оно еще не выполняется"""
+
+        def refresh() -> None:
+            try:
+                value = fetch()
+                if is_valid(value):
+                    self.set(key, value)
+                else:
+                    logger.warning(f"Фоновое обновление '{key}' вернуло некорректное значение")
+            except Exception as e:
+                logger.error(f"Ошибка фонового обновления '{key}': {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.pop(key, None)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            thread = threading.Thread(target=refresh, name=f"quote-refresh-{key}", daemon=True)
+            self._refreshing[key] = thread
+        thread.start()
+
+    def _load(self) -> None:
+        """Загружает записи из JSON-файла"""
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Не удалось прочитать кэш котировок {self.persist_path}: {e}")
+            return
+
+        for key, entry in entries.items():
+            self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        """Сохраняет записи в JSON-файл"""
+        with self._lock:
+            entries = dict(self._entries)
+
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_name(f"{self.persist_path.name}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Не удалось сохранить кэш котировок {self.persist_path}: {e}")
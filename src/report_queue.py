@@ -0,0 +1,130 @@
+import itertools
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.reports import write_report
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Размер очереди отчетов, ожидающих записи
+REPORT_QUEUE_SIZE = 32
+
+
+class BackgroundReportWriter:
+    """
+    Фоновая запись отчетов в файлы
+
+    Отчеты попадают в ограниченную очередь и записываются одним рабочим потоком
+    в порядке поступления, поэтому для каждого файла побеждает последняя запись.
+    Если в очереди уже есть более новый отчет для того же файла, старый не записывается.
+    Когда очередь заполнена, submit ждет освобождения места.
+
+    Результат не копируется: вызывающий код не должен изменять его до записи.
+    """
+
+    def __init__(self, max_queue: int = REPORT_QUEUE_SIZE):
+        """
+        Args:
+            max_queue: Максимальное число отчетов, ожидающих записи
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._sequence = itertools.count()
+        self._latest: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, result: Any, file_name: str, report_name: str, output_format: str = "json") -> None:
+        """
+        Ставит отчет в очередь на запись
+
+        Args:
+            result: Результат функции-отчета
+            file_name: Имя файла
+            report_name: Название отчета
+            output_format: Формат из REPORT_FORMATS
+
+        Raises:
+            RuntimeError: если запись уже остановлена через close
+        """
+        generated_at = datetime.now().isoformat()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Фоновая запись отчетов остановлена")
+            sequence = next(self._sequence)
+            self._latest[file_name] = sequence
+
+        self._queue.put((sequence, result, file_name, report_name, output_format, generated_at))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидает записи всех отчетов, поставленных в очередь
+
+        Args:
+            timeout: Максимальное время ожидания в секундах. Если None, ждет без ограничения
+
+        Returns:
+            True, если все отчеты записаны, False, если время ожидания истекло
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Записывает оставшиеся отчеты и останавливает рабочий поток
+
+        Args:
+            timeout: Максимальное время ожидания остановки в секундах
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "BackgroundReportWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Рабочий цикл: записывает отчеты из очереди до получения признака остановки"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self,
+               sequence: int,
+               result: Any,
+               file_name: str,
+               report_name: str,
+               output_format: str,
+               generated_at: str) -> None:
+        """Записывает отчет, если для файла нет более нового отчета в очереди"""
+        with self._lock:
+            if self._latest.get(file_name) != sequence:
+                logger.debug(f"Отчет {file_name} пропущен: в очереди есть более новый")
+                return
+            self._latest.pop(file_name)
+
+        try:
+            write_report(result, file_name, report_name, output_format, generated_at)
+            logger.info(f"Отчет сохранен в файл ({output_format}): {file_name}")
+        except Exception as e:
+            logger.error(f"Ошибка при фоновой записи отчета в файл {file_name}: {e}")
@@ -1,86 +1,449 @@
+import numpy as np
 import pandas as pd
-from typing import Optional, Callable
+from typing import Any, Hashable, Iterable, List, Optional, Callable
+import functools
+import importlib.util
 import json
 from datetime import datetime, timedelta
 import logging
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+
+from src.transactions import (
+    DATE_COLUMN,
+    TransactionStore,
+    from_kopecks,
+    is_normalized,
+    parse_operation_dates,
+    to_kopecks,
+)
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Число строк DataFrame, сериализуемых за один шаг при потоковой записи отчета
+REPORT_CHUNK_SIZE = 10_000
+
+# Ограничения кэша результатов spending_by_category
+SPENDING_CACHE_MAX_ENTRIES = 128
+SPENDING_CACHE_MAX_ROWS = 1_000_000
+
+# Поддерживаемые форматы отчетов и расширения файлов
+REPORT_FORMATS = {
+    "json": ".json",
+    "json_compact": ".json",
+    "jsonl": ".jsonl",
+    "csv": ".csv",
+    "parquet": ".parquet",
+}
+
+# Движки pandas для записи Parquet (необязательные зависимости, группа "parquet" в pyproject.toml)
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+# Кодировщики отдельных значений (используют C-реализацию json)
+_SCALAR_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_encode_basestring = json.encoder.encode_basestring
+
+
+def _convert_value(value: Any) -> Any:
+    """Преобразует отдельное значение в тип, пригодный для JSON"""
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    elif isinstance(value, pd.Timedelta):
+        return str(value)
+    return value
+
+
+def _format_datetimes(dates: pd.Series) -> pd.Series:
+    """
+    Форматирует колонку дат в строки ISO 8601 без обхода значений в Python
+
+    Args:
+        dates: Колонка с типом datetime64
+
+    Returns:
+        Колонка строк в формате, совпадающем с Timestamp.isoformat()
+    """
+    if isinstance(dates.dtype, pd.DatetimeTZDtype) or ((dates.dt.microsecond != 0) | (dates.dt.nanosecond != 0)).any():
+        # Часовой пояс и доли секунды форматируем поэлементно, как isoformat()
+        return dates.map(lambda value: value.isoformat())
+
+    values = dates.to_numpy(dtype="datetime64[ns]")
+    return pd.Series(np.datetime_as_string(values, unit="s"), index=dates.index)
+
+
+def _encode_generic(value: Any, compact: bool = False) -> str:
+    """
+    Кодирует произвольное значение поля записи в JSON
+
+    В обычном режиме вложенные структуры получают отступы, как json.dump(..., indent=2)
+    на уровне поля записи, в компактном - кодируются без пробелов.
+    """
+    if compact:
+        return _COMPACT_ENCODER.encode(value)
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n      ')
+    return _SCALAR_ENCODER.encode(value)
+
+
+def _encode_column(series: pd.Series, compact: bool = False) -> List[str]:
+    """
+    Кодирует колонку в список JSON-значений
+
+    Даты приводятся к строкам ISO 8601, пропуски - к null. Для числовых, логических
+    и строковых колонок значения кодируются без вызова json-кодировщика на каждое значение.
+
+    Args:
+        series: Колонка части DataFrame
+        compact: Кодировать вложенные структуры без отступов
+
+    Returns:
+        Список JSON-текстов значений колонки
+    """
+    missing = series.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = _format_datetimes(series).tolist()
+        return ["null" if is_missing else _encode_basestring(value) for value, is_missing in zip(values, missing)]
+
+    if pd.api.types.is_timedelta64_dtype(series):
+        values = series.map(str).tolist()
+        return ["null" if is_missing else _encode_basestring(value) for value, is_missing in zip(values, missing)]
+
+    kind = series.dtype.kind
+    if kind == "b":
+        return ["true" if value else "false" for value in series.tolist()]
+
+    if kind in "iu":
+        return list(map(int.__repr__, series.tolist()))
+
+    if kind == "f" and not np.isinf(series.to_numpy()).any():
+        return ["null" if is_missing else float.__repr__(value) for value, is_missing in zip(series.tolist(), missing)]
+
+    values = series.astype(object).tolist()
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+        return ["null" if is_missing else _encode_basestring(value) for value, is_missing in zip(values, missing)]
+
+    return [
+        "null" if is_missing else _encode_generic(_convert_value(value), compact)
+        for value, is_missing in zip(values, missing)
+    ]
+
+
+def _encode_records(chunk: pd.DataFrame) -> str:
+    """
+    Кодирует записи части DataFrame в JSON-текст элементов массива "data"
+
+    Значения кодируются по колонкам, а отступы расставляются вручную, поэтому результат
+    совпадает с json.dump(..., indent=2) без медленного Python-кодировщика с отступами.
+
+    Args:
+        chunk: Часть DataFrame с результатом отчета
+
+    Returns:
+        Записи через запятую с отступами уровня элементов "data"
+    """
+    if len(chunk.columns) == 0:
+        return ",\n".join(["    {}"] * len(chunk))
+
+    encoded_columns = []
+    for i, column in enumerate(chunk.columns):
+        prefix = f"      {_encode_basestring(column if isinstance(column, str) else str(column))}: "
+        encoded_columns.append([prefix + text for text in _encode_column(chunk.iloc[:, i])])
+
+    return ",\n".join("    {\n" + ",\n".join(fields) + "\n    }" for fields in zip(*encoded_columns))
+
+
+def dataframe_to_json(df: pd.DataFrame, chunk_size: int = REPORT_CHUNK_SIZE) -> str:
+    """
+    Кодирует DataFrame в компактный JSON-массив записей
+
+    Использует те же кодировщики колонок, что и запись отчетов: даты - ISO 8601, пропуски - null.
+
+    Args:
+        df: DataFrame с результатом отчета
+        chunk_size: Число строк, кодируемых за один шаг
+
+    Returns:
+        Текст JSON-массива
+    """
+    parts = []
+    for start in range(0, len(df), chunk_size):
+        parts.extend(_encode_compact_records(df.iloc[start:start + chunk_size]))
+    return "[" + ",".join(parts) + "]"
+
+
+def _encode_compact_records(chunk: pd.DataFrame) -> List[str]:
+    """
+    Кодирует записи части DataFrame в компактные JSON-объекты без пробелов
+
+    Args:
+        chunk: Часть DataFrame с результатом отчета
+
+    Returns:
+        Список JSON-текстов записей
+    """
+    if len(chunk.columns) == 0:
+        return ["{}"] * len(chunk)
+
+    encoded_columns = []
+    for i, column in enumerate(chunk.columns):
+        prefix = f"{_encode_basestring(column if isinstance(column, str) else str(column))}:"
+        encoded_columns.append([prefix + text for text in _encode_column(chunk.iloc[:, i], compact=True)])
+
+    return ["{" + ",".join(fields) + "}" for fields in zip(*encoded_columns)]
+
+
+def write_dataframe_json(df: pd.DataFrame,
+                         file_name: str,
+                         report_name: str,
+                         generated_at: str,
+                         chunk_size: int = REPORT_CHUNK_SIZE,
+                         compact: bool = False) -> None:
+    """
+    Потоково записывает DataFrame в JSON-файл отчета
+
+    Записи сериализуются частями по chunk_size строк и сразу пишутся в файл,
+    поэтому расход памяти не зависит от числа строк. Формат файла совпадает с
+    json.dump({"report_name": ..., "generated_at": ..., "data": [...]}, indent=2),
+    а в компактном режиме - с json.dump(..., separators=(',', ':')).
+
+    Args:
+        df: DataFrame с результатом отчета
+        file_name: Имя файла
+        report_name: Название отчета
+        generated_at: Время формирования отчета
+        chunk_size: Число строк в одной части
+        compact: Записывать JSON без отступов и пробелов
+    """
+    metadata = {"report_name": report_name, "generated_at": generated_at}
+
+    with open(file_name, 'w', encoding='utf-8') as f:
+        if compact:
+            f.write(_COMPACT_ENCODER.encode(metadata)[:-1])
+            f.write(',"data":[')
+            for start in range(0, len(df), chunk_size):
+                if start:
+                    f.write(',')
+                f.write(','.join(_encode_compact_records(df.iloc[start:start + chunk_size])))
+            f.write(']}')
+            return
+
+        # Заголовок без закрывающей скобки, далее массив записей
+        header = json.dumps(metadata, ensure_ascii=False, indent=2)
+        f.write(header[:-2])
+        f.write(',\n  "data": ')
 
-def report_writer(filename: Optional[str] = None):
+        if df.empty:
+            f.write('[]\n}')
+            return
+
+        f.write('[\n')
+        for start in range(0, len(df), chunk_size):
+            if start:
+                f.write(',\n')
+            f.write(_encode_records(df.iloc[start:start + chunk_size]))
+        f.write('\n  ]\n}')
+
+
+def write_dataframe_jsonl(df: pd.DataFrame, file_name: str, chunk_size: int = REPORT_CHUNK_SIZE) -> None:
+    """
+    Потоково записывает DataFrame в файл JSON Lines (одна запись на строку)
+
+    Args:
+        df: DataFrame с результатом отчета
+        file_name: Имя файла
+        chunk_size: Число строк в одной части
+    """
+    with open(file_name, 'w', encoding='utf-8') as f:
+        for start in range(0, len(df), chunk_size):
+            for record in _encode_compact_records(df.iloc[start:start + chunk_size]):
+                f.write(record)
+                f.write('\n')
+
+
+def metadata_path(file_name: str) -> Path:
+    """
+    Возвращает путь к файлу метаданных отчета
+
+    Args:
+        file_name: Имя файла отчета
+
+    Returns:
+        Путь вида '<имя отчета>.meta.json'
+    """
+    return Path(file_name).with_suffix('.meta.json')
+
+
+def _convert_datetime(obj: Any) -> Any:
+    """Рекурсивно преобразует datetime объекты и пропуски в словарях и списках"""
+    if isinstance(obj, dict):
+        return {k: _convert_datetime(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_convert_datetime(item) for item in obj]
+    elif isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    elif isinstance(obj, pd.Timedelta):
+        return str(obj)
+    elif pd.isna(obj):
+        return None
+    else:
+        return obj
+
+
+def _to_frame(result: Any) -> pd.DataFrame:
+    """Приводит результат отчета к DataFrame для табличных форматов"""
+    if isinstance(result, pd.DataFrame):
+        return result
+    if isinstance(result, list):
+        return pd.DataFrame(result)
+    if isinstance(result, dict):
+        return pd.DataFrame([result])
+    return pd.DataFrame({"result": [result]})
+
+
+def parquet_engine_available() -> bool:
+    """Проверяет, установлен ли один из движков записи Parquet, не импортируя его"""
+    return any(importlib.util.find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+
+def write_report(result: Any,
+                 file_name: str,
+                 report_name: str,
+                 output_format: str = "json",
+                 generated_at: Optional[str] = None) -> None:
+    """
+    Записывает результат отчета в файл в указанном формате
+
+    Для "json" и "json_compact" метаданные (report_name, generated_at) хранятся в самом документе,
+    для "jsonl" и "csv" - в файле '<имя>.meta.json' рядом с отчетом,
+    для "parquet" - в метаданных файла (DataFrame.attrs).
+
+    Args:
+        result: Результат функции-отчета
+        file_name: Имя файла
+        report_name: Название отчета
+        output_format: Формат из REPORT_FORMATS
+        generated_at: Время формирования отчета. Если None, используется текущее время
+    """
+    generated_at = generated_at or datetime.now().isoformat()
+    metadata = {"report_name": report_name, "generated_at": generated_at}
+
+    if output_format in ("json", "json_compact"):
+        compact = output_format == "json_compact"
+
+        if isinstance(result, pd.DataFrame):
+            # DataFrame записываем потоково, частями, без построения всего списка записей в памяти
+            write_dataframe_json(result, file_name, report_name, generated_at, compact=compact)
+            return
+
+        if isinstance(result, (dict, list)):
+            # Для словарей и списков используем как есть, преобразуя datetime объекты
+            result_data = _convert_datetime(result)
+        else:
+            # Для других типов оборачиваем в словарь
+            result_data = {"result": result}
+
+        # Добавляем метаданные отчета
+        report_with_metadata = {**metadata, "data": result_data}
+
+        # Сохраняем в JSON файл
+        with open(file_name, 'w', encoding='utf-8') as f:
+            if compact:
+                json.dump(report_with_metadata, f, ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(report_with_metadata, f, ensure_ascii=False, indent=2)
+        return
+
+    if isinstance(result, (dict, list)):
+        result = _convert_datetime(result)
+    frame = _to_frame(result)
+
+    if output_format == "parquet":
+        # Метаданные сохраняются в файле: pandas записывает DataFrame.attrs в схему Parquet
+        frame = frame.copy(deep=False)
+        frame.attrs = {**frame.attrs, **metadata}
+        frame.to_parquet(file_name, index=False)
+        return
+
+    if output_format == "jsonl":
+        write_dataframe_jsonl(frame, file_name)
+    else:
+        frame.to_csv(file_name, index=False, encoding='utf-8', date_format='%Y-%m-%dT%H:%M:%S')
+
+    with open(metadata_path(file_name), 'w', encoding='utf-8') as f:
+        json.dump({**metadata, "format": output_format, "rows": len(frame)}, f, ensure_ascii=False, indent=2)
+
+
+# Фоновая запись отчетов (по умолчанию отключена, см. set_report_queue)
+_report_queue: Optional[Any] = None
+
+
+def set_report_queue(report_queue: Optional[Any]) -> None:
+    """
+    Подключает фоновую запись отчетов
+
+    Пока очередь подключена, декоратор report_writer не пишет файл сам,
+    а передает результат в очередь и сразу возвращает его вызывающему коду.
+
+    Args:
+        report_queue: Экземпляр BackgroundReportWriter или None для синхронной записи
+    """
+    global _report_queue
+    _report_queue = report_queue
+
+
+def report_writer(filename: Optional[str] = None, output_format: str = "json"):
     """
     Декоратор для записи результатов функций-отчетов в файлы.
 
     Args:
         filename: Имя файла для записи результатов.
-                 Если None, генерируется имя на основе имени функции и даты.
+                 Если None, используется 'report_result' с расширением формата.
+        output_format: Формат файла: "json" (с отступами), "json_compact", "jsonl", "csv" или "parquet".
+
+    Raises:
+        ValueError: если формат неизвестен
+        ImportError: если для "parquet" не установлен ни pyarrow, ни fastparquet
     """
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {output_format}. Доступны: {', '.join(REPORT_FORMATS)}")
+
+    # Без движка Parquet отчет упал бы только после расчета, при записи файла
+    if output_format == "parquet" and not parquet_engine_available():
+        raise ImportError(
+            f"Для формата parquet нужен один из пакетов: {', '.join(PARQUET_ENGINES)}. "
+            "Установите pyarrow: pip install pyarrow"
+        )
+
+    extension = REPORT_FORMATS[output_format]
 
     def decorator(func: Callable):
+        # functools.wraps сохраняет имя и docstring, а исходная функция доступна как __wrapped__
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Выполняем функцию-отчет
             result = func(*args, **kwargs)
 
             # Определяем имя файла
             if filename:
-                file_name = filename if filename.endswith('.json') else f"{filename}.json"
+                file_name = filename if filename.endswith(extension) else f"{filename}{extension}"
             else:
                 # Всегда используем фиксированное имя файла
-                file_name = "report_result.json"
+                file_name = f"report_result{extension}"
+
+            if _report_queue is not None:
+                # Запись выполнит фоновый поток очереди
+                _report_queue.submit(result, file_name, func.__name__, output_format)
+                return result
 
             # Записываем результат в файл
             try:
-                if isinstance(result, pd.DataFrame):
-                    # Для DataFrame преобразуем в список словарей
-                    # Важно: преобразуем Timestamp в строки для сериализации
-                    result_data = result.to_dict('records')
-
-                    # Преобразуем все datetime объекты в строки
-                    for record in result_data:
-                        for key, value in record.items():
-                            if pd.isna(value):
-                                record[key] = None
-                            elif isinstance(value, (pd.Timestamp, datetime)):
-                                record[key] = value.isoformat()
-                            elif isinstance(value, pd.Timedelta):
-                                record[key] = str(value)
-                elif isinstance(result, (dict, list)):
-                    # Для словарей и списков используем как есть
-                    result_data = result
-
-                    # Рекурсивно преобразуем datetime объекты
-                    def convert_datetime(obj):
-                        if isinstance(obj, dict):
-                            return {k: convert_datetime(v) for k, v in obj.items()}
-                        elif isinstance(obj, list):
-                            return [convert_datetime(item) for item in obj]
-                        elif isinstance(obj, (pd.Timestamp, datetime)):
-                            return obj.isoformat()
-                        elif isinstance(obj, pd.Timedelta):
-                            return str(obj)
-                        elif pd.isna(obj):
-                            return None
-                        else:
-                            return obj
-
-                    result_data = convert_datetime(result_data)
-                else:
-                    # Для других типов оборачиваем в словарь
-                    result_data = {"result": result}
-
-                # Добавляем метаданные отчета
-                report_with_metadata = {
-                    "report_name": func.__name__,
-                    "generated_at": datetime.now().isoformat(),
-                    "data": result_data
-                }
-
-                # Сохраняем в JSON файл
-                with open(file_name, 'w', encoding='utf-8') as f:
-                    json.dump(report_with_metadata, f, ensure_ascii=False, indent=2)
-                logger.info(f"Отчет сохранен в JSON файл: {file_name}")
+                write_report(result, file_name, func.__name__, output_format)
+                logger.info(f"Отчет сохранен в файл ({output_format}): {file_name}")
 
             except Exception as e:
                 logger.error(f"Ошибка при записи отчета в файл: {e}")
@@ -94,28 +457,100 @@ def report_writer(filename: Optional[str] = None):
     return decorator
 
 
-@report_writer()  # Использование без параметра - файл будет создан автоматически
-def spending_by_category(transactions: pd.DataFrame,
-                         category: str,
-                         date: Optional[str] = None) -> pd.DataFrame:
+class ResultCache:
+    """
+    LRU-кэш результатов отчетов в виде DataFrame
+
+    Ключ должен включать отпечаток данных (см. TransactionStore.fingerprint), поэтому при изменении
+    операций старые записи просто перестают находиться и со временем вытесняются.
+    Размер ограничен числом записей и суммарным числом строк в сохраненных результатах.
+    Наружу отдаются копии, чтобы изменение результата не портило кэш.
     """
-        Функция возвращает траты по заданной категории за последние три месяца.
 
+    def __init__(self, max_entries: int = SPENDING_CACHE_MAX_ENTRIES, max_rows: int = SPENDING_CACHE_MAX_ROWS):
+        """
         Args:
-            transactions: DataFrame с транзакциями
-            category: Название категории для фильтрации
-            date: Дата, от которой отсчитываются три месяца (в формате 'DD.MM.YYYY')
-                  Если None, используется текущая дата
+            max_entries: Максимальное число сохраненных результатов
+            max_rows: Максимальное суммарное число строк в сохраненных результатах
+        """
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[Hashable, pd.DataFrame] = OrderedDict()
+        self._rows = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        Возвращает копию сохраненного результата
+
+        Args:
+            key: Ключ результата
 
         Returns:
-            DataFrame с транзакциями по указанной категории за последние три месяца
-    """
+            Копия DataFrame или None, если результата нет
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return result.copy()
 
-    df = transactions.copy()
+    def set(self, key: Hashable, result: pd.DataFrame) -> None:
+        """
+        Сохраняет копию результата, вытесняя давно не использованные записи
 
-    # Преобразуем колонки с датами
-    df['Дата операции'] = pd.to_datetime(df['Дата операции'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
+        Args:
+            key: Ключ результата
+            result: DataFrame с результатом отчета
+        """
+        if len(result) > self.max_rows:
+            return
+
+        stored = result.copy()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= len(previous)
+
+            self._entries[key] = stored
+            self._rows += len(stored)
+
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+
+    def clear(self) -> None:
+        """Удаляет все сохраненные результаты"""
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Кэш результатов spending_by_category
+spending_cache = ResultCache()
+
+
+def _report_period(date: Optional[str]) -> tuple:
+    """
+    Возвращает период отчета по тратам: три месяца (90 дней) до указанной даты
+
+    Args:
+        date: Дата в формате 'DD.MM.YYYY'. Если None, используется текущая дата
 
+    Returns:
+        Кортеж (начало периода, конец периода)
+    """
     # Определяем дату отсчета
     if date:
         end_date = pd.to_datetime(date, format='%d.%m.%Y')
@@ -123,21 +558,99 @@ def spending_by_category(transactions: pd.DataFrame,
         end_date = pd.to_datetime(datetime.now())
 
     # Вычисляем дату начала периода (три месяца назад)
-    start_date = end_date - timedelta(days=90)
+    return end_date - timedelta(days=90), end_date
+
+
+def _period_expenses(transactions: pd.DataFrame | TransactionStore | Iterable[pd.DataFrame],
+                     start_date: pd.Timestamp,
+                     end_date: pd.Timestamp,
+                     category: Optional[str] = None) -> pd.DataFrame:
+    """
+    Выбирает расходные операции за период, при необходимости только по одной категории
+
+    Исходный DataFrame не изменяется и не копируется целиком: даты разбираются
+    в отдельную колонку, а новый DataFrame создается только из отобранных строк.
+    Части DataFrame (например, из iter_operations_chunks) обрабатываются по одной,
+    в памяти остаются только отобранные строки.
+
+    Args:
+        transactions: DataFrame с транзакциями, отсортированное хранилище операций или части DataFrame
+        start_date: Начало периода (включительно)
+        end_date: Конец периода (включительно)
+        category: Категория. Если None, возвращаются расходы по всем категориям
+
+    Returns:
+        Новый DataFrame с отобранными операциями в исходном порядке и датами типа datetime64
+    """
+    if not isinstance(transactions, (pd.DataFrame, TransactionStore)):
+        selected = [_period_expenses(chunk, start_date, end_date, category) for chunk in transactions]
+        if not selected:
+            return pd.DataFrame(columns=[DATE_COLUMN, 'Категория', 'Сумма операции'])
+        return pd.concat(selected, ignore_index=True)
+
+    if isinstance(transactions, TransactionStore):
+        # Хранилище отсортировано по дате: окно выбирается бинарным поиском без копирования
+        df = transactions.window(start_date, end_date)
+        dates = None
+        mask = df['Сумма операции'] < 0
+    else:
+        df = transactions
+
+        # Разбираем даты отдельно от DataFrame (канонический DataFrame уже содержит datetime64)
+        dates = df[DATE_COLUMN]
+        if not is_normalized(df):
+            dates = parse_operation_dates(dates, errors='coerce')
+
+        # Фильтруем по дате (последние три месяца)
+        mask = (dates >= start_date) & (dates <= end_date) & (df['Сумма операции'] < 0)
+
+    if category is not None:
+        mask &= df['Категория'] == category
+
+    selected = df[mask]
+    if dates is not None and not is_normalized(df):
+        # Разобранные даты подставляем только в отобранные строки
+        selected = selected.assign(**{DATE_COLUMN: dates[mask]})
+    return selected
+
+
+@report_writer()  # Использование без параметра - файл будет создан автоматически
+def spending_by_category(transactions: pd.DataFrame | TransactionStore | Iterable[pd.DataFrame],
+                         category: str,
+                         date: Optional[str] = None) -> pd.DataFrame:
+    """
+        Функция возвращает траты по заданной категории за последние три месяца.
+
+        Args:
+            transactions: DataFrame с транзакциями, отсортированное хранилище операций
+                          или части DataFrame (например, из iter_operations_chunks)
+            category: Название категории для фильтрации
+            date: Дата, от которой отсчитываются три месяца (в формате 'DD.MM.YYYY')
+                  Если None, используется текущая дата
+
+        Returns:
+            DataFrame с транзакциями по указанной категории за последние три месяца
+    """
+
+    start_date, end_date = _report_period(date)
 
-    # Фильтруем по дате (последние три месяца)
-    mask_date = (df['Дата операции'] >= start_date) & (df['Дата операции'] <= end_date)
+    # Повторный запрос по тем же данным, категории и периоду берем из кэша. Кэшируются только
+    # запросы к хранилищу: его отпечаток вычисляется один раз и обновляется в append. Для DataFrame
+    # отпечаток пришлось бы считать по всем ячейкам при каждом вызове, а это дольше самого отбора.
+    # Без даты период отсчитывается от текущего момента, такой ключ не повторится - не кэшируем
+    fingerprint = transactions.fingerprint if isinstance(transactions, TransactionStore) else None
+    cache_key = (fingerprint, category, start_date, end_date) if fingerprint and date else None
 
-    # Фильтры
-    mask_category = df['Категория'] == category
-    mask_expense = df['Сумма операции'] < 0
-    filtered_df = df[mask_date & mask_category & mask_expense].copy()
+    if cache_key is not None:
+        cached = spending_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Траты по категории '{category}' взяты из кэша")
+            return cached
 
-    # Сортируем по дате
-    filtered_df = filtered_df.sort_values('Дата операции', ascending=False)
+    filtered_df = _period_expenses(transactions, start_date, end_date, category)
 
-    # Сбрасываем индекс
-    filtered_df = filtered_df.reset_index(drop=True)
+    # Сортируем по дате и сбрасываем индекс
+    filtered_df = filtered_df.sort_values('Дата операции', ascending=False, ignore_index=True)
 
     # Вычисляем общую сумму расходов по категории
     if len(filtered_df) > 0:
@@ -147,4 +660,68 @@ def spending_by_category(transactions: pd.DataFrame,
     else:
         logger.info(f"Нет данных по категории '{category}' за последние 3 месяца")
 
+    if cache_key is not None:
+        spending_cache.set(cache_key, filtered_df)
+
     return filtered_df
+
+
+def _json_records(df: pd.DataFrame) -> List[dict]:
+    """Преобразует DataFrame в список записей с датами ISO 8601 и None вместо пропусков"""
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = _format_datetimes(df[column]).where(df[column].notna(), None)
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+@report_writer(filename="report_categories")
+def spending_by_categories(transactions: pd.DataFrame | TransactionStore | Iterable[pd.DataFrame],
+                           date: Optional[str] = None,
+                           include_transactions: bool = False) -> pd.DataFrame:
+    """
+        Функция возвращает траты по всем категориям за последние три месяца за один проход по данным.
+
+        Args:
+            transactions: DataFrame с транзакциями, отсортированное хранилище операций
+                          или части DataFrame (например, из iter_operations_chunks)
+            date: Дата, от которой отсчитываются три месяца (в формате 'DD.MM.YYYY')
+                  Если None, используется текущая дата
+            include_transactions: Добавить колонку 'Операции' со списком операций категории
+                                  (по убыванию даты, как в spending_by_category)
+
+        Returns:
+            DataFrame с колонками 'Категория', 'Сумма расходов', 'Количество операций'
+            (и 'Операции'), отсортированный по убыванию суммы расходов
+    """
+
+    start_date, end_date = _report_period(date)
+    expenses = _period_expenses(transactions, start_date, end_date)
+
+    # Суммы складываются в целых копейках
+    kopecks = pd.Series(-to_kopecks(expenses['Сумма операции']), index=expenses.index)
+    grouped = kopecks.groupby(expenses['Категория'], sort=False, observed=True)
+    summary = pd.DataFrame({
+        'Сумма расходов': from_kopecks(grouped.sum()),
+        'Количество операций': grouped.size(),
+    })
+    summary = summary.sort_values('Сумма расходов', ascending=False, kind='stable')
+    summary.index = summary.index.astype(object)
+    summary = summary.rename_axis('Категория').reset_index()
+
+    if include_transactions:
+        # Записи формируем один раз для всех операций и раскладываем по категориям
+        expenses = expenses.sort_values('Дата операции', ascending=False)
+        records = _json_records(expenses)
+        positions = expenses['Категория'].reset_index(drop=True).groupby(
+            expenses['Категория'].to_numpy(), sort=False
+        ).indices
+        operations = {category: [records[i] for i in rows] for category, rows in positions.items()}
+        summary['Операции'] = summary['Категория'].map(operations)
+
+    logger.info(
+        f"Расходы за последние 3 месяца: {summary['Сумма расходов'].sum():.2f} RUB "
+        f"по {len(summary)} категориям"
+    )
+
+    return summary
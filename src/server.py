@@ -0,0 +1,204 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Корень проекта должен быть в sys.path, чтобы модули src импортировались как пакет
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.loader import CACHE_DIR, DATA_DIR, load_statements  # noqa: E402
+from src.quote_cache import QuoteCache  # noqa: E402
+from src.reports import dataframe_to_json, spending_by_categories, spending_by_category  # noqa: E402
+from src.services import investment_bank_df  # noqa: E402
+from src.transactions import TransactionStore  # noqa: E402
+from src.views import create_summary_json, set_quote_cache  # noqa: E402
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+
+SUMMARY_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+REPORT_DATE_FORMAT = "%d.%m.%Y"
+MONTH_FORMAT = "%Y-%m"
+
+
+class BadRequest(ValueError):
+    """Ошибка в параметрах запроса (ответ 400)"""
+
+
+def _param(query: Dict[str, list], name: str, default: Optional[str] = None) -> Optional[str]:
+    """Возвращает последнее значение параметра запроса или значение по умолчанию"""
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def _required(query: Dict[str, list], name: str) -> str:
+    """Возвращает обязательный параметр запроса"""
+    value = _param(query, name)
+    if not value:
+        raise BadRequest(f"Не указан параметр '{name}'")
+    return value
+
+
+def _checked_date(value: Optional[str], date_format: str, name: str) -> Optional[str]:
+    """Проверяет формат даты, чтобы ошибка в параметре давала 400, а не пустой отчет"""
+    if value is None:
+        return None
+    try:
+        datetime.strptime(value, date_format)
+    except ValueError:
+        raise BadRequest(f"Неверный формат параметра '{name}': {value}")
+    return value
+
+
+class SummaryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP-запросов к отчетам
+
+    Все эндпоинты работают с хранилищем операций, загруженным один раз при старте сервера
+    (server.store). Отчеты возвращаются в ответе и не записываются в файлы.
+    """
+
+    server_version = "BankingAnalytics/1.0"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        handler = self.routes.get(url.path.rstrip("/") or "/")
+        if handler is None:
+            self._send_json(404, json.dumps({"error": f"Неизвестный путь: {url.path}"}, ensure_ascii=False))
+            return
+
+        try:
+            status, body = handler(self, parse_qs(url.query))
+        except BadRequest as e:
+            status, body = 400, json.dumps({"error": str(e)}, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Ошибка при обработке запроса {self.path}: {e}")
+            status, body = 500, json.dumps({"error": "Внутренняя ошибка сервера"}, ensure_ascii=False)
+        self._send_json(status, body)
+
+    @property
+    def store(self) -> TransactionStore:
+        return self.server.store
+
+    def _health(self, query: Dict[str, list]) -> Tuple[int, str]:
+        return 200, json.dumps({"status": "ok", "transactions": len(self.store.df)})
+
+    def _summary(self, query: Dict[str, list]) -> Tuple[int, str]:
+        target_date = _param(query, "date") or datetime.now().strftime(SUMMARY_DATE_FORMAT)
+        _checked_date(target_date, SUMMARY_DATE_FORMAT, "date")
+        return 200, json.dumps(create_summary_json(self.store, target_date), ensure_ascii=False)
+
+    def _spending(self, query: Dict[str, list]) -> Tuple[int, str]:
+        category = _required(query, "category")
+        date = _checked_date(_param(query, "date"), REPORT_DATE_FORMAT, "date")
+        # __wrapped__ - функция без декоратора report_writer: сервер не пишет отчет в файл на каждый запрос
+        result = spending_by_category.__wrapped__(self.store, category, date)
+        return 200, dataframe_to_json(result)
+
+    def _categories(self, query: Dict[str, list]) -> Tuple[int, str]:
+        date = _checked_date(_param(query, "date"), REPORT_DATE_FORMAT, "date")
+        include_transactions = _param(query, "include_transactions", "0").lower() in ("1", "true", "yes")
+        result = spending_by_categories.__wrapped__(self.store, date, include_transactions)
+        return 200, dataframe_to_json(result)
+
+    def _investment(self, query: Dict[str, list]) -> Tuple[int, str]:
+        month = _checked_date(_required(query, "month"), MONTH_FORMAT, "month")
+        try:
+            limit = int(_required(query, "limit"))
+        except ValueError:
+            raise BadRequest("Параметр 'limit' должен быть целым числом")
+        if limit <= 0:
+            raise BadRequest("Параметр 'limit' должен быть положительным")
+        total = investment_bank_df(month, self.store, limit)
+        return 200, json.dumps({"month": month, "limit": limit, "total": total})
+
+    routes: Dict[str, Callable[["SummaryRequestHandler", Dict[str, list]], Tuple[int, str]]] = {
+        "/health": _health,
+        "/summary": _summary,
+        "/spending": _spending,
+        "/spending/categories": _categories,
+        "/investment": _investment,
+    }
+
+    def _send_json(self, status: int, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def create_server(store: TransactionStore, host: str = SERVER_HOST, port: int = SERVER_PORT) -> ThreadingHTTPServer:
+    """
+    Создает HTTP-сервер отчетов над загруженным хранилищем операций
+
+    Отпечаток хранилища вычисляется сразу, чтобы первый запрос не тратил на него время.
+
+    Args:
+        store: Отсортированное хранилище операций
+        host: Адрес для прослушивания
+        port: Порт (0 - выбрать свободный)
+
+    Returns:
+        Сервер; запуск - serve_forever(), остановка - shutdown() и server_close()
+    """
+    server = ThreadingHTTPServer((host, port), SummaryRequestHandler)
+    server.daemon_threads = True
+    server.store = store
+    store.fingerprint
+    return server
+
+
+def load_store(data_dir: Path | str = DATA_DIR) -> TransactionStore:
+    """
+    Загружает все выписки каталога в хранилище операций
+
+    Args:
+        data_dir: Каталог с выписками
+
+    Returns:
+        Отсортированное хранилище операций
+    """
+    df, load_report = load_statements(data_dir)
+    for file_report in load_report:
+        if file_report["error"]:
+            logger.error(f"Ошибка загрузки {file_report['path']}: {file_report['error']}")
+    return TransactionStore(df)
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Загружает выписки один раз и обслуживает запросы, пока процесс не будет остановлен"""
+    parser = argparse.ArgumentParser(description="HTTP-сервер отчетов по банковским операциям")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    # Кэш курсов валют и котировок общий для всех запросов
+    set_quote_cache(QuoteCache(persist_path=CACHE_DIR / "quotes.json"))
+
+    server = create_server(load_store(args.data_dir), args.host, args.port)
+    logger.info(f"Сервер отчетов запущен на http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
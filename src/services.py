@@ -1,75 +1,272 @@
-import math
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Sequence
 import logging
 
+import numpy as np
+import pandas as pd
+
+from src.transactions import DATE_COLUMN, TransactionStore, from_kopecks, parse_operation_dates, to_kopecks
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def investment_bank(month: str, transactions: List[Dict[str, Any]], limit: int) -> float:
-    """
-       Рассчитывает сумму для инвесткопилки через округление трат.
+AMOUNT_COLUMN = 'Сумма операции'
 
-       Args:
-           month: Месяц, для которого рассчитывается отложенная сумма, строка в формате 'DD.MM.YYYY HH:MM:SS'
-           transactions: Список словарей с информацией о:
-               - 'Дата операции': дата в формате 'DD.MM.YYYY HH:MM:SS'
-               - 'Сумма операции': сумма транзакции в оригинальной валюте (число)
-           limit: Предел для округления суммы операций - целое число (10, 50, 100 и т.д.)
 
-       Returns:
-           Сумма, которую удалось бы отложить в инвесткопилку
+def _month_bounds(month: str) -> Optional[tuple[np.datetime64, np.datetime64]]:
     """
+    Возвращает границы месяца [начало, начало следующего месяца)
 
-    total_investment = 0.00
+    Args:
+        month: Месяц в формате 'YYYY-MM'
 
+    Returns:
+        Кортеж границ или None, если формат месяца неверный
+    """
     try:
-        # Проверяем корректность месяца
-        datetime.strptime(month, '%Y-%m')
+        month_start = datetime.strptime(month, '%Y-%m')
     except ValueError:
-        logger.error(f"Неверный формат месяца: {month}. Ожидается 'DD.MM.YYYY HH:MM:SS'")
-        return 0.00
+        logger.error(f"Неверный формат месяца: {month}. Ожидается 'YYYY-MM'")
+        return None
 
+    start = np.datetime64(month_start.strftime('%Y-%m'), 'M')
+    return start.astype('datetime64[ns]'), (start + 1).astype('datetime64[ns]')
+
+
+def _limit_kopecks(limit: float) -> Optional[int]:
+    """Переводит предел округления в копейки; для неположительного предела возвращает None"""
     if limit <= 0:
         logger.warning(f"Лимит должен быть положительным числом. Получено: {limit}")
+        return None
+    return int(round(limit * 100))
+
+
+def _kopeck_residuals(kopecks: np.ndarray, limit_kopecks: int) -> np.ndarray:
+    """
+    Вычисляет суммы в копейках, откладываемые с расходов при округлении до limit
+
+    Для расхода -a остаток до ближайшего большего кратного limit равен (-a) mod limit,
+    поэтому расчет выполняется в целых числах без ошибок округления. Для сумм >= 0 результат - 0.
+    """
+    return np.where(kopecks < 0, np.mod(kopecks, limit_kopecks), 0)
+
+
+def _investment_residuals(month: str, dates: np.ndarray, amounts: np.ndarray, limit: int) -> Optional[np.ndarray]:
+    """
+    Вычисляет суммы в копейках, откладываемые с каждой операции месяца
+
+    Args:
+        month: Месяц в формате 'YYYY-MM'
+        dates: Массив дат операций (datetime64), некорректные даты - NaT
+        amounts: Массив сумм операций (float64), некорректные суммы - NaN
+        limit: Предел для округления суммы операций
+
+    Returns:
+        Массив int64 откладываемых сумм в копейках или None при некорректном месяце или лимите
+    """
+    bounds = _month_bounds(month)
+    if bounds is None:
+        return None
+
+    limit_kopecks = _limit_kopecks(limit)
+    if limit_kopecks is None:
+        return None
+
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+
+    # NaT не проходит сравнения, поэтому операции с некорректной датой отсекаются маской
+    mask = (dates >= bounds[0]) & (dates < bounds[1])
+    return _kopeck_residuals(to_kopecks(np.asarray(amounts, dtype=np.float64)[mask]), limit_kopecks)
+
+
+def investment_bank_arrays(month: str, dates: np.ndarray, amounts: np.ndarray, limit: int) -> float:
+    """
+       Векторизованный расчет суммы для инвесткопилки по массивам дат и сумм.
+
+       Args:
+           month: Месяц в формате 'YYYY-MM'
+           dates: Массив дат операций (datetime64), некорректные даты - NaT
+           amounts: Массив сумм операций (float64), некорректные суммы - NaN
+           limit: Предел для округления суммы операций - целое число (10, 50, 100 и т.д.)
+
+       Returns:
+           Сумма, которую удалось бы отложить в инвесткопилку
+    """
+    investments = _investment_residuals(month, dates, amounts, limit)
+    if investments is None:
         return 0.00
 
-    for transaction in transactions:
-        try:
-            # Проверяем необходимые поля
-            if 'Дата операции' not in transaction or 'Сумма операции' not in transaction:
-                logger.warning("Транзакция не содержит необходимых полей")
-                continue
+    # Сумма целых копеек точна и не зависит от порядка сложения
+    total_investment = from_kopecks(int(investments.sum()))
 
-            # Парсим дату операции
-            op_date = datetime.strptime(transaction['Дата операции'], '%d.%m.%Y %H:%M:%S')
+    logger.info(f"За месяц {month} с лимитом округления {limit} ₽ отложено: {total_investment:.2f} ₽")
+    return round(total_investment, 2)
+
+
+def investment_bank_chunks(month: str, chunks: Iterable[pd.DataFrame], limit: int) -> float:
+    """
+       Рассчитывает сумму для инвесткопилки по операциям, поступающим частями.
 
-            # Проверяем, относится ли транзакция к указанному месяцу
-            if op_date.strftime('%Y-%m') != month:
-                continue
+       Частичные суммы считаются в целых копейках, поэтому итог совпадает
+       с расчетом по всем операциям сразу.
 
-            # Получаем сумму операции
-            amount = float(transaction['Сумма операции'])
+       Args:
+           month: Месяц в формате 'YYYY-MM'
+           chunks: Части DataFrame с колонками 'Дата операции' и 'Сумма операции' (например, из iter_operations_chunks)
+           limit: Предел для округления суммы операций - целое число (10, 50, 100 и т.д.)
 
-            # Если сумма отрицательная (трата), то округляем
-            if amount < 0:
-                # Берем абсолютное значение для округления
-                abs_amount = abs(amount)
+       Returns:
+           Сумма, которую удалось бы отложить в инвесткопилку
+    """
+    total_kopecks = 0
+    for chunk in chunks:
+        investments = _investment_residuals(month, *_transaction_arrays(chunk), limit)
+        if investments is None:
+            return 0.00
+        total_kopecks += int(investments.sum())
 
-                # Округляем до ближайшего кратного limit
-                rounded_amount = math.ceil(abs_amount / limit) * limit
+    total_investment = from_kopecks(total_kopecks)
+    logger.info(f"За месяц {month} с лимитом округления {limit} ₽ отложено: {total_investment:.2f} ₽")
+    return round(total_investment, 2)
 
-                # Вычисляем разницу (инвестируемая сумма)
-                investment = rounded_amount - abs_amount
 
-                if investment > 0:
-                    total_investment += investment
-                    logger.debug(f"Транзакция {op_date.date()}: {abs_amount} ₽ -> {rounded_amount} ₽, отложено: {investment} ₽")
+def _transaction_arrays(transactions: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Извлекает из DataFrame массивы дат (datetime64) и сумм (float64) операций
 
-        except (ValueError, KeyError) as e:
-            logger.warning(f"Ошибка обработки транзакции: {e}")
-            continue
+    Args:
+        transactions: DataFrame с колонками 'Дата операции' и 'Сумма операции'
+
+    Returns:
+        Кортеж массивов; некорректные даты заменены на NaT, суммы - на NaN
+    """
+    if DATE_COLUMN not in transactions.columns or AMOUNT_COLUMN not in transactions.columns:
+        logger.warning("Транзакции не содержат необходимых полей")
+        return np.array([], dtype='datetime64[ns]'), np.array([], dtype=np.float64)
+
+    dates = parse_operation_dates(transactions[DATE_COLUMN], errors='coerce').to_numpy(dtype='datetime64[ns]')
+    amounts = pd.to_numeric(transactions[AMOUNT_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+
+    invalid_count = int(np.isnat(dates).sum() + np.isnan(amounts).sum())
+    if invalid_count:
+        logger.warning(f"Пропущено некорректных значений в транзакциях: {invalid_count}")
+
+    return dates, amounts
+
+
+def investment_bank_df(month: str, transactions: pd.DataFrame | TransactionStore, limit: int) -> float:
+    """
+       Рассчитывает сумму для инвесткопилки по DataFrame с операциями.
+
+       Для хранилища операций месяц выбирается бинарным поиском, а расчет идет
+       по уже хранимым суммам в копейках.
+
+       Args:
+           month: Месяц в формате 'YYYY-MM'
+           transactions: DataFrame с колонками 'Дата операции' и 'Сумма операции' или хранилище операций
+           limit: Предел для округления суммы операций - целое число (10, 50, 100 и т.д.)
+
+       Returns:
+           Сумма, которую удалось бы отложить в инвесткопилку
+    """
+    if not isinstance(transactions, TransactionStore):
+        dates, amounts = _transaction_arrays(transactions)
+        return investment_bank_arrays(month, dates, amounts, limit)
+
+    bounds = _month_bounds(month)
+    limit_kopecks = _limit_kopecks(limit) if bounds else None
+    if bounds is None or limit_kopecks is None or AMOUNT_COLUMN not in transactions.columns:
+        return 0.00
+
+    left, right = transactions.bounds(bounds[0], bounds[1], inclusive_end=False)
+    investments = _kopeck_residuals(transactions.kopecks(AMOUNT_COLUMN)[left:right], limit_kopecks)
+    total_investment = from_kopecks(int(investments.sum()))
 
     logger.info(f"За месяц {month} с лимитом округления {limit} ₽ отложено: {total_investment:.2f} ₽")
-    return round(total_investment, 2)
\ No newline at end of file
+    return round(total_investment, 2)
+
+
+def investment_bank_matrix(transactions: pd.DataFrame,
+                           months: Optional[Sequence[str]] = None,
+                           limits: Sequence[int] = (10, 50, 100)) -> pd.DataFrame:
+    """
+       Рассчитывает таблицу сумм для инвесткопилки "месяц × лимит" за один проход по данным.
+
+       Args:
+           transactions: DataFrame с колонками 'Дата операции' и 'Сумма операции'
+           months: Месяцы в формате 'YYYY-MM'. Если None, берутся все месяцы с тратами
+           limits: Пределы для округления суммы операций
+
+       Returns:
+           DataFrame, где индекс - месяцы (корректные - в виде 'YYYY-MM', без повторов),
+           колонки - лимиты, значения - отложенные суммы.
+           Для некорректного месяца или неположительного лимита значения равны 0
+    """
+    dates, amounts = _transaction_arrays(transactions)
+
+    # Оставляем только траты с корректными датами
+    expense_mask = ~np.isnat(dates) & (amounts < 0)
+    op_months = dates[expense_mask].astype('datetime64[M]')
+    kopecks = to_kopecks(amounts[expense_mask])
+
+    if months is None:
+        months = [str(month) for month in np.unique(op_months)]
+
+    # Корректные месяцы приводим к виду 'YYYY-MM' ('2021-1' и '2021-01' - один месяц),
+    # некорректные оставляем как есть; повторы убираем
+    labels = {}
+    for month in months:
+        bounds = _month_bounds(month)
+        key = bounds[0].astype('datetime64[M]') if bounds else None
+        labels.setdefault(str(key) if key is not None else month, key)
+    months = list(labels)
+
+    limits_array = np.asarray(limits, dtype=np.float64)
+    positive_limits = limits_array > 0
+    if not positive_limits.all():
+        logger.warning(f"Лимит должен быть положительным числом. Получено: {list(limits_array[~positive_limits])}")
+
+    # Остатки округления в копейках для всех лимитов сразу: матрица "операция × лимит"
+    limits_kopecks = np.where(positive_limits, np.rint(limits_array * 100), 1).astype(np.int64)
+    residuals = _kopeck_residuals(kopecks[:, None], limits_kopecks)
+    residuals[:, ~positive_limits] = 0
+
+    # Номер строки результата для каждой операции (-1, если месяц не запрошен)
+    valid_months = [month for month, key in labels.items() if key is not None]
+    month_index = pd.Index(np.array([labels[month] for month in valid_months], dtype='datetime64[M]'))
+    rows = month_index.get_indexer(op_months) if len(op_months) else np.array([], dtype=np.intp)
+    selected = rows >= 0
+
+    month_totals = np.zeros((len(valid_months), len(limits_array)), dtype=np.int64)
+    np.add.at(month_totals, rows[selected], residuals[selected])
+
+    # Некорректные месяцы получают нулевую строку
+    totals = np.zeros((len(months), len(limits_array)), dtype=np.int64)
+    totals[[months.index(month) for month in valid_months]] = month_totals
+
+    logger.info(f"Рассчитана таблица инвесткопилки: {len(months)} мес. × {len(limits_array)} лимитов")
+    return pd.DataFrame(from_kopecks(totals).round(2), index=pd.Index(months, name='month'), columns=list(limits))
+
+
+def investment_bank(month: str, transactions: List[Dict[str, Any]], limit: int) -> float:
+    """
+       Рассчитывает сумму для инвесткопилки через округление трат.
+
+       Args:
+           month: Месяц, для которого рассчитывается отложенная сумма, строка в формате 'YYYY-MM'
+           transactions: Список словарей с информацией о:
+               - 'Дата операции': дата в формате 'DD.MM.YYYY HH:MM:SS' или объект datetime
+               - 'Сумма операции': сумма транзакции в оригинальной валюте (число)
+           limit: Предел для округления суммы операций - целое число (10, 50, 100 и т.д.)
+
+       Returns:
+           Сумма, которую удалось бы отложить в инвесткопилку
+    """
+    # Записи без необходимых полей пропускаем, остальные считаем векторизованно
+    valid_transactions = [t for t in transactions if DATE_COLUMN in t and AMOUNT_COLUMN in t]
+    if len(valid_transactions) != len(transactions):
+        logger.warning("Транзакция не содержит необходимых полей")
+
+    df = pd.DataFrame(valid_transactions, columns=[DATE_COLUMN, AMOUNT_COLUMN])
+    return investment_bank_df(month, df, limit)
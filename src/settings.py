@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Модуль не импортирует pandas и requests: настройки доступны командам, которым не нужны данные и сеть
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+USER_SETTINGS_PATH = BASE_DIR / "user_settings.json"
+ENV_PATH = "../.env"
+
+DEFAULT_USER_SETTINGS = {
+    "user_currencies": ["USD", "EUR"],
+    "user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"],
+}
+
+
+@lru_cache(maxsize=None)
+def load_user_settings() -> Dict[str, Any]:
+    """
+    Читает user_settings.json при первом обращении
+
+    Returns:
+        Словарь пользовательских настроек или настройки по умолчанию, если файла нет
+    """
+    try:
+        with open(USER_SETTINGS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.warning("Файл user_settings.json не найден. Используются настройки по умолчанию.")
+        return dict(DEFAULT_USER_SETTINGS)
+
+
+@lru_cache(maxsize=None)
+def load_environment() -> None:
+    """Загружает переменные из .env один раз, при первом обращении к параметрам окружения"""
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_PATH)
+
+
+def env_setting(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Возвращает параметр окружения с учетом .env
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение, если переменная не задана
+
+    Returns:
+        Значение переменной или default
+    """
+    load_environment()
+    return os.getenv(name, default)
@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Настройка логирования
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Колонка, по абсолютному значению которой выбираются крупнейшие расходы
+TOP_AMOUNT_COLUMN = "Сумма платежа"
+TOP_DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+
+def top_positions(values: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Возвращает позиции top_n наибольших значений массива
+
+    Выбор выполняется через np.argpartition за линейное время, сортируются только
+    отобранные значения. Порядок совпадает с DataFrame.nlargest(keep="first"):
+    по убыванию значения, при равенстве - по возрастанию позиции.
+
+    Args:
+        values: Одномерный массив значений
+        top_n: Число позиций
+
+    Returns:
+        Массив позиций длиной min(top_n, len(values))
+    """
+    if top_n <= 0 or len(values) == 0:
+        return np.array([], dtype=np.intp)
+
+    if top_n < len(values):
+        threshold = values[np.argpartition(values, len(values) - top_n)[len(values) - top_n]]
+        above = np.flatnonzero(values > threshold)
+        # Из равных пороговому значению берем самые ранние, как nlargest(keep="first")
+        at_threshold = np.flatnonzero(values == threshold)[:top_n - len(above)]
+        candidates = np.concatenate([above, at_threshold])
+    else:
+        candidates = np.arange(len(values))
+
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def _expense_values(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Возвращает позиции расходов и их абсолютные суммы без копирования DataFrame
+
+    Returns:
+        Кортеж (позиции строк с расходами, абсолютные суммы платежа этих строк)
+    """
+    amounts = df[TOP_AMOUNT_COLUMN].to_numpy(dtype=np.float64)
+    positions = np.flatnonzero(amounts < 0)
+    return positions, -amounts[positions]
+
+
+def build_top_records(rows: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Формирует записи о транзакциях для ответа API
+
+    Колонки форматируются целиком (dt.strftime, str-методы), без обхода строк через iterrows.
+
+    Args:
+        rows: Отобранные строки DataFrame с операциями
+
+    Returns:
+        Список словарей с ключами date, amount, category, description, card_last_digits
+    """
+    if rows.empty:
+        return []
+
+    cards = rows["Номер карты"]
+    card_digits = cards.astype(object).astype(str).str[-4:].where(cards.notna().to_numpy(), "N/A")
+
+    columns = {
+        "date": rows["Дата операции"].dt.strftime(TOP_DATE_FORMAT).tolist(),
+        "amount": [round(abs(amount), 2) for amount in rows[TOP_AMOUNT_COLUMN].tolist()],
+        "category": rows["Категория"].astype(object).tolist(),
+        "description": rows["Описание"].astype(object).tolist(),
+        "card_last_digits": card_digits.tolist(),
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def top_transactions(df: pd.DataFrame, top_n: int = 5) -> List[Dict[str, Any]]:
+    """
+    Возвращает top_n крупнейших расходов по абсолютной сумме платежа
+
+    Args:
+        df: DataFrame с операциями
+        top_n: Количество транзакций
+
+    Returns:
+        Список словарей с информацией о транзакциях по убыванию суммы
+    """
+    positions, values = _expense_values(df)
+    return build_top_records(df.iloc[positions[top_positions(values, top_n)]])
+
+
+def top_transactions_by(df: pd.DataFrame, column: str, top_n: int = 5) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Возвращает top_n крупнейших расходов для каждого значения колонки за один проход
+
+    Расходы один раз упорядочиваются по (группа, сумма по убыванию, позиция),
+    после чего из каждой группы берутся первые top_n строк.
+
+    Args:
+        df: DataFrame с операциями
+        column: Колонка группировки, например 'Номер карты' или 'Категория'
+        top_n: Количество транзакций в каждой группе
+
+    Returns:
+        Словарь {значение колонки: список транзакций}; строки без значения колонки не учитываются
+    """
+    positions, values = _expense_values(df)
+    codes, groups = pd.factorize(df[column].to_numpy()[positions], sort=False)
+
+    valid = codes >= 0
+    positions, values, codes = positions[valid], values[valid], codes[valid]
+    if top_n <= 0 or len(positions) == 0:
+        return {}
+
+    order = np.lexsort((positions, -values, codes))
+    sorted_codes = codes[order]
+
+    # Номер строки внутри своей группы: позиция в упорядоченном массиве минус начало группы
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    selected = order[ranks < top_n]
+
+    records = build_top_records(df.iloc[positions[selected]])
+    result: Dict[Any, List[Dict[str, Any]]] = {}
+    for code, record in zip(codes[selected], records):
+        result.setdefault(groups[code], []).append(record)
+    return result
+
+
+class TopTransactionsAccumulator:
+    """
+    Накопитель крупнейших расходов для данных, поступающих частями
+
+    Из каждой части берутся ее top_n расходов (argpartition), которые сливаются
+    в ограниченную кучу размера top_n. Итог совпадает с top_transactions по всем данным.
+    """
+
+    def __init__(self, top_n: int = 5):
+        """
+        Args:
+            top_n: Количество транзакций
+        """
+        self.top_n = top_n
+        # Элементы кучи: (сумма, -порядковый номер, запись); на вершине - наименьший из отобранных
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+
+    def add(self, df: pd.DataFrame) -> None:
+        """
+        Учитывает очередную часть операций
+
+        Args:
+            df: DataFrame с операциями
+        """
+        if self.top_n <= 0 or df.empty:
+            return
+
+        positions, values = _expense_values(df)
+        selected = top_positions(values, self.top_n)
+        records = build_top_records(df.iloc[positions[selected]])
+
+        # Порядковые номера в порядке строк, чтобы при равных суммах побеждала более ранняя
+        sequences = {position: next(self._sequence) for position in np.sort(selected)}
+        for position, value, record in zip(selected, values[selected], records):
+            item = (float(value), -sequences[position], record)
+            if len(self._heap) < self.top_n:
+                heapq.heappush(self._heap, item)
+            elif item[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, item)
+
+    def result(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает накопленные транзакции по убыванию суммы
+
+        Returns:
+            Список словарей в формате top_transactions
+        """
+        return [record for _, _, record in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
@@ -1,44 +1,103 @@
-import json
 import logging
-import os
-from datetime import datetime, time
-from typing import Dict, List
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
+import numpy as np
 import pandas as pd
 import requests
-from dotenv import load_dotenv
+
+from src.http_client import RequestCoalescer, TokenBucket, get_with_retry
+from src.quote_cache import QuoteCache
+from src import settings
+from src.top_transactions import top_transactions
+from src.transactions import (
+    DATE_COLUMN,
+    KOPECKS_PER_RUBLE,
+    TransactionStore,
+    from_kopecks,
+    is_normalized,
+    parse_operation_dates,
+    to_kopecks,
+)
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-# Загрузка пользовательских настроек
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-USER_SETTINGS_PATH = os.path.join(BASE_DIR, "user_settings.json")
+# Пользовательские настройки и параметры API из .env загружаются при первом обращении,
+# а не при импорте модуля (см. user_setting и settings.env_setting)
+USER_SETTINGS: Dict[str, Any] = {}
 
-try:
-    with open(USER_SETTINGS_PATH, "r", encoding="utf-8") as f:
-        USER_SETTINGS = json.load(f)
-except FileNotFoundError:
-    USER_SETTINGS = {
-        "user_currencies": ["USD", "EUR"],
-        "user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"],
-    }
-    logger.warning(
-        "Файл user_settings.json не найден. Используются настройки по умолчанию."
-    )
+# Значения по умолчанию для параметров окружения STOCKS_BATCH_SIZE и STOCKS_RATE_LIMIT:
+# число тикеров в одном запросе (больше 1, если API поддерживает тикеры через запятую)
+# и ограничение частоты запросов к API котировок в секунду
+DEFAULT_STOCKS_BATCH_SIZE = "1"
+DEFAULT_STOCKS_RATE_LIMIT = "5"
+
+# Параметры параллельного получения котировок
+STOCKS_MAX_WORKERS = 5
+STOCKS_REQUEST_TIMEOUT = 20
+STOCKS_DEADLINE = 20
+
+# Повторы запросов к API котировок при 429
+STOCKS_MAX_RETRIES = 2
+STOCKS_BACKOFF = 0.25
+
+# Ограничитель частоты создается при первом запросе котировок (см. _get_stocks_rate_limiter)
+_stocks_rate_limiter: Optional[TokenBucket] = None
+_stocks_coalescer = RequestCoalescer()
+
+_http_session: Optional[requests.Session] = None
+
+# Кэш курсов валют и котировок (по умолчанию отключен, см. set_quote_cache)
+_quote_cache: Optional[QuoteCache] = None
+
+
+def user_setting(name: str, default: Any = None) -> Any:
+    """
+    Возвращает пользовательскую настройку
+
+    user_settings.json читается при первом обращении. Значения, уже заданные
+    в USER_SETTINGS (например, в тестах), имеют приоритет над файлом.
+
+    Args:
+        name: Имя настройки, например 'user_currencies'
+        default: Значение, если настройки нет
+
+    Returns:
+        Значение настройки
+    """
+    if name not in USER_SETTINGS:
+        for key, value in settings.load_user_settings().items():
+            USER_SETTINGS.setdefault(key, value)
+    return USER_SETTINGS.get(name, default)
 
 
-# Конфигурация из .env
-load_dotenv("../.env")
+def _get_stocks_rate_limiter() -> TokenBucket:
+    """Возвращает ограничитель частоты запросов к API котировок, создавая его при первом обращении"""
+    global _stocks_rate_limiter
+    if _stocks_rate_limiter is None:
+        rate = float(settings.env_setting("STOCKS_RATE_LIMIT", DEFAULT_STOCKS_RATE_LIMIT))
+        # При лимите меньше 1 запроса в секунду корзина все равно должна вмещать один токен
+        _stocks_rate_limiter = TokenBucket(rate=rate, capacity=max(1.0, rate))
+    return _stocks_rate_limiter
 
-CURRENCY_API_URL = os.getenv("CURRENCY_API_URL")
-CURRENCY_API_KEY = os.getenv("CURRENCY_API_KEY")
 
-STOCKS_API_URL = os.getenv("STOCKS_API_URL")
-STOCKS_API_KEY = os.getenv("STOCKS_API_KEY")
+def set_quote_cache(cache: Optional[QuoteCache]) -> None:
+    """
+    Подключает кэш курсов валют и котировок акций
+
+    Args:
+        cache: Экземпляр QuoteCache или None для отключения кэша
+    """
+    global _quote_cache
+    _quote_cache = cache
 
 
 def time_response() -> str | None:
@@ -59,12 +118,12 @@ def time_response() -> str | None:
         return None
 
 
-def filter_data_by_date(df: pd.DataFrame, target_date: str) -> pd.DataFrame:
+def filter_data_by_date(df: pd.DataFrame | TransactionStore, target_date: str) -> pd.DataFrame:
     """
     Фильтрует данные с начала месяца до указанной даты
 
     Args:
-        df: DataFrame с данными операций
+        df: DataFrame с данными операций или отсортированное хранилище операций
         target_date: Дата в формате 'YYYY-MM-DD HH:MM:SS'
 
     Returns:
@@ -74,10 +133,13 @@ def filter_data_by_date(df: pd.DataFrame, target_date: str) -> pd.DataFrame:
         target_datetime = datetime.strptime(target_date, "%Y-%m-%d %H:%M:%S")
         start_of_month = target_datetime.replace(day=1)
 
-        # Преобразуем даты в DataFrame
-        df["Дата операции"] = pd.to_datetime(
-            df["Дата операции"], format="%d.%m.%Y %H:%M:%S"
-        )
+        # Хранилище отсортировано по дате: окно выбирается бинарным поиском без копирования
+        if isinstance(df, TransactionStore):
+            return df.window(start_of_month, target_datetime)
+
+        # Преобразуем даты в DataFrame, если они еще не разобраны
+        if not is_normalized(df):
+            df[DATE_COLUMN] = parse_operation_dates(df[DATE_COLUMN])
 
         # Фильтруем данные
         mask = (df["Дата операции"] >= start_of_month) & (
@@ -86,51 +148,118 @@ def filter_data_by_date(df: pd.DataFrame, target_date: str) -> pd.DataFrame:
         return df[mask].copy()
     except Exception as e:
         logger.error(f"Ошибка при фильтрации данных: {e}")
-        return df
+        return df.df if isinstance(df, TransactionStore) else df
 
 
-def get_card_summary(filtered_df: pd.DataFrame) -> List[Dict]:
+def _card_expense_totals(df: pd.DataFrame) -> pd.Series:
     """
-    Рассчитывает статистику по картам
+    Суммирует расходы по картам за один проход группировки
 
     Args:
-        filtered_df: Отфильтрованный DataFrame с операциями
+        df: DataFrame с операциями
 
     Returns:
-        Список словарей со статистикой по картам
+        Series: индекс - номера карт в порядке первого появления, значения - суммы расходов в копейках (int64)
     """
-    card_stats = []
+    kopecks = to_kopecks(df["Сумма операции"])
 
-    # Убираем пустые номера карт
-    df_with_cards = filtered_df[filtered_df["Номер карты"].notna()]
+    # Доходы не учитываются, но карта с одними пополнениями остается в результате с нулем
+    expenses = pd.Series(-np.minimum(kopecks, 0), index=df.index)
 
-    if df_with_cards.empty:
-        return card_stats
+    # Операции без номера карты отбрасываются группировкой (dropna=True)
+    return expenses.groupby(df["Номер карты"], sort=False, observed=True).sum()
 
-    # Группируем по картам
-    for card_num in df_with_cards["Номер карты"].unique():
-        card_data = df_with_cards[df_with_cards["Номер карты"] == card_num]
 
-        # Фильтруем только расходы (отрицательные суммы)
-        expenses = card_data[card_data["Сумма операции"] < 0]
-        total_expenses = abs(expenses["Сумма операции"].sum())
+def _format_card_stats(totals: Iterable[Tuple[object, int]]) -> List[Dict]:
+    """Формирует статистику по картам из пар (номер карты, сумма расходов в копейках)"""
+    card_stats = []
 
-        # Расчет кэшбэка (1 рубль на каждые 100 рублей расходов)
-        cashback = total_expenses // 100
+    for card_num, expenses_kopecks in totals:
+        # Расчет кэшбэка (1 рубль на каждые 100 рублей расходов, то есть на каждые 10000 копеек)
+        cashback = int(expenses_kopecks) // (100 * KOPECKS_PER_RUBLE)
 
         card_stats.append(
             {
                 "card_last_digits": (
                     str(card_num)[-4:] if len(str(card_num)) >= 4 else str(card_num)
                 ),
-                "total_expenses": round(total_expenses, 2),
-                "cashback": int(cashback),
+                "total_expenses": round(from_kopecks(int(expenses_kopecks)), 2),
+                "cashback": cashback,
             }
         )
 
     return card_stats
 
 
+def get_card_summary(filtered_df: pd.DataFrame) -> List[Dict]:
+    """
+    Рассчитывает статистику по картам
+
+    Args:
+        filtered_df: Отфильтрованный DataFrame с операциями
+
+    Returns:
+        Список словарей со статистикой по картам
+    """
+    if filtered_df.empty:
+        return []
+
+    return _format_card_stats(_card_expense_totals(filtered_df).items())
+
+
+class CardSummaryAccumulator:
+    """
+    Накопитель статистики по картам для пополняемых данных
+
+    Суммы расходов по картам обновляются при добавлении новых операций,
+    без повторного расчета по уже учтенным данным.
+    """
+
+    def __init__(self) -> None:
+        # Суммы расходов по картам в копейках
+        self._totals: Dict[object, int] = {}
+
+    def add(self, df: pd.DataFrame) -> None:
+        """
+        Учитывает новые операции
+
+        Args:
+            df: DataFrame с добавленными операциями
+        """
+        if df.empty:
+            return
+
+        for card_num, total_expenses in _card_expense_totals(df).items():
+            self._totals[card_num] = self._totals.get(card_num, 0) + int(total_expenses)
+
+    def summary(self) -> List[Dict]:
+        """
+        Возвращает статистику по картам в формате get_card_summary
+
+        Returns:
+            Список словарей со статистикой по картам
+        """
+        return _format_card_stats(self._totals.items())
+
+
+def get_card_summary_chunks(chunks: Iterable[pd.DataFrame], target_date: Optional[str] = None) -> List[Dict]:
+    """
+    Рассчитывает статистику по картам по операциям, поступающим частями
+
+    Args:
+        chunks: Части DataFrame с операциями (например, из iter_operations_chunks)
+        target_date: Дата в формате 'YYYY-MM-DD HH:MM:SS'. Если указана, учитываются
+                     только операции с начала месяца до этой даты
+
+    Returns:
+        Список словарей со статистикой по картам в формате get_card_summary
+    """
+    accumulator = CardSummaryAccumulator()
+    for chunk in chunks:
+        accumulator.add(filter_data_by_date(chunk, target_date) if target_date else chunk)
+    return accumulator.summary()
+
+
 def get_top_transactions(filtered_df: pd.DataFrame, top_n: int = 5) -> List[Dict]:
     """
     Возвращает топ-N транзакций по сумме платежа
@@ -142,43 +271,37 @@ def get_top_transactions(filtered_df: pd.DataFrame, top_n: int = 5) -> List[Dict
     Returns:
         Список словарей с информацией о транзакциях
     """
-    # Берем только расходы для анализа
-    expenses_df = filtered_df[filtered_df["Сумма платежа"] < 0].copy()
-
-    if expenses_df.empty:
-        return []
-
-    # Сортируем по абсолютной сумме платежа
-    expenses_df["abs_amount"] = abs(expenses_df["Сумма платежа"])
-    top_expenses = expenses_df.nlargest(top_n, "abs_amount")
-
-    top_transactions = []
-    for _, row in top_expenses.iterrows():
-        transaction = {
-            "date": row["Дата операции"].strftime("%d.%m.%Y %H:%M:%S"),
-            "amount": round(abs(row["Сумма платежа"]), 2),
-            "category": row["Категория"],
-            "description": row["Описание"],
-            "card_last_digits": (
-                str(row["Номер карты"])[-4:] if pd.notna(row["Номер карты"]) else "N/A"
-            ),
-        }
-        top_transactions.append(transaction)
-
-    return top_transactions
+    # Выбор по массиву абсолютных сумм расходов (argpartition), без копирования DataFrame
+    return top_transactions(filtered_df, top_n)
 
 
 def get_currency_rates() -> Dict[str, float]:
     """
     Получает курсы валют из API
+    При подключенном кэше свежие курсы берутся из него, а при ошибке API
+    возвращаются последние известные курсы
 
     Returns:
         Словарь с курсами валют
     """
+    if _quote_cache is None:
+        return _fetch_currency_rates()
+
+    user_currencies = user_setting("user_currencies", [])
+    return _quote_cache.get_or_fetch(f"currency_rates:{','.join(user_currencies)}", _fetch_currency_rates)
+
+
+def _fetch_currency_rates() -> Dict[str, float]:
+    """
+    Запрашивает курсы валют из API
+
+    Returns:
+        Словарь с курсами валют или пустой словарь при ошибке
+    """
 
     try:
 
-        url = f"{CURRENCY_API_URL}{CURRENCY_API_KEY}/latest/RUB"
+        url = f"{settings.env_setting('CURRENCY_API_URL')}{settings.env_setting('CURRENCY_API_KEY')}/latest/RUB"
 
         response = requests.get(url, timeout=10)
         if response.status_code == 200:
@@ -186,7 +309,7 @@ def get_currency_rates() -> Dict[str, float]:
             rates = data.get("rates", {})
 
             # Фильтруем только нужные валюты
-            user_currencies = USER_SETTINGS.get("user_currencies", [])
+            user_currencies = user_setting("user_currencies", [])
             filtered_rates = {}
 
             for currency in user_currencies:
@@ -207,13 +330,137 @@ def get_currency_rates() -> Dict[str, float]:
     return {}
 
 
-def get_stock_prices() -> list:
+def get_http_session() -> requests.Session:
+    """
+    Возвращает общую HTTP-сессию с пулом соединений
+
+    Returns:
+        Сессия requests, переиспользующая соединения между запросами
+    """
+    global _http_session
+
+    if _http_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=STOCKS_MAX_WORKERS, pool_maxsize=STOCKS_MAX_WORKERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+
+    return _http_session
+
+
+def _fetch_stock_batch(session: requests.Session, stocks: List[str], timeout: float) -> Dict[str, Dict]:
+    """
+    Получает цены группы акций одним запросом
+
+    Тикеры передаются через запятую; одинаковые одновременные запросы объединяются,
+    частота запросов ограничивается, а при 429 и ошибках сервера запрос повторяется.
+
+    Args:
+        session: HTTP-сессия для запроса
+        stocks: Тикеры акций
+        timeout: Таймаут запроса в секундах
+
+    Returns:
+        Словарь {тикер: словарь с информацией об акции}
+    """
+    url = (
+        f"{settings.env_setting('STOCKS_API_URL')}{','.join(stocks)}"
+        f"&apikey={settings.env_setting('STOCKS_API_KEY')}"
+    )
+    tickers = ", ".join(stocks)
+
+    try:
+        response = _stocks_coalescer.run(
+            url,
+            lambda: get_with_retry(
+                session, url, timeout, _get_stocks_rate_limiter(), retries=STOCKS_MAX_RETRIES, backoff=STOCKS_BACKOFF
+            ),
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+
+            if not data or not isinstance(data, list):
+                logger.warning(f"Пустой ответ для акций {tickers}")
+                return {stock: {"stock": stock, "price": 0, "error": "Данные не получены"} for stock in stocks}
+
+            # Для одного тикера поле symbol в ответе не обязательно
+            if len(stocks) == 1:
+                by_symbol = {stocks[0]: data[0]}
+            else:
+                by_symbol = {item.get("symbol"): item for item in data if isinstance(item, dict)}
+
+            result = {}
+            for stock in stocks:
+                if stock in by_symbol:
+                    price = round(by_symbol[stock].get("price", 0), 2)
+                    logger.debug(f"Получена цена для {stock}: ${price}")
+                    result[stock] = {"stock": stock, "price": price}
+                else:
+                    logger.warning(f"Пустой ответ для акции {stock}")
+                    result[stock] = {"stock": stock, "price": 0, "error": "Данные не получены"}
+            return result
+
+        elif response.status_code == 429:
+            logger.warning(f"Превышен лимит запросов для акций {tickers}")
+            return {stock: {"stock": stock, "price": 0, "error": "Превышен лимит запросов API"} for stock in stocks}
+
+        logger.warning(f"Код ответа {response.status_code} для акций {tickers}")
+        return {
+            stock: {"stock": stock, "price": 0, "error": f"Код ответа API: {response.status_code}"}
+            for stock in stocks
+        }
+
+    except requests.exceptions.Timeout:
+        logger.error(f"Таймаут при запросе акций {tickers}")
+
+    except requests.exceptions.ConnectionError:
+        logger.error(f"Ошибка соединения для акций {tickers}")
+
+    except Exception as e:
+        logger.error(f"Неизвестная ошибка для акций {tickers}: {e}")
+
+    return {stock: {"stock": stock, "price": 0} for stock in stocks}
+
+
+def _is_valid_quote(quote: Dict) -> bool:
+    """Проверяет, что котировка получена успешно и ее можно кэшировать"""
+    return quote.get("price", 0) > 0 and "error" not in quote
+
+
+def _get_stock_batch(session: requests.Session, stocks: List[str], timeout: float) -> List[Dict]:
+    """Получает цены группы акций через кэш котировок, если он подключен"""
+    if _quote_cache is None:
+        fetched = _fetch_stock_batch(session, stocks, timeout)
+        return [fetched[stock] for stock in stocks]
+
+    # Первый промах кэша запрашивает всю группу, остальные тикеры берут результат из нее
+    fetched: Dict[str, Dict] = {}
+
+    def fetch(stock: str) -> Dict:
+        if stock not in fetched:
+            fetched.update(_fetch_stock_batch(session, stocks, timeout))
+        return fetched[stock]
+
+    return [
+        _quote_cache.get_or_fetch(f"stock:{stock}", lambda stock=stock: fetch(stock), _is_valid_quote)
+        for stock in stocks
+    ]
+
+
+def get_stock_prices(max_workers: int = STOCKS_MAX_WORKERS, deadline: float = STOCKS_DEADLINE) -> list:
     """
     Получает цены на акции из Financial Modeling Prep API
-    Делает отдельный запрос для каждой акции
+    Тикеры группируются по STOCKS_BATCH_SIZE, группы запрашиваются параллельно
+    через общую HTTP-сессию, при подключенном кэше свежие котировки берутся из него
+
+    Args:
+        max_workers: Максимальное число одновременных запросов
+        deadline: Общее время ожидания всех котировок в секундах
 
     Returns:
-        Список словарей с информацией об акциях в формате:
+        Список словарей с информацией об акциях в порядке настроек:
         [
             {"stock": "AAPL", "price": 150.12},
             {"stock": "AMZN", "price": 3173.18},
@@ -221,55 +468,35 @@ def get_stock_prices() -> list:
         ]
     """
     stocks_list = []
-    user_stocks = USER_SETTINGS.get("user_stocks", [])
+    user_stocks = user_setting("user_stocks", [])
 
     if not user_stocks:
         logger.warning("Нет акций для отслеживания в настройках")
         return stocks_list
 
-    for stock in user_stocks:
-        try:
-            url = f"{STOCKS_API_URL}{stock}&apikey={STOCKS_API_KEY}"
-            response = requests.get(url, timeout=20)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if data and isinstance(data, list) and len(data) > 0:
-                    stock_data = data[0]
+    session = get_http_session()
+    request_timeout = min(STOCKS_REQUEST_TIMEOUT, deadline)
+    deadline_at = time.monotonic() + deadline
 
-                    stocks_list.append(
-                        {"stock": stock, "price": round(stock_data.get("price", 0), 2)}
-                    )
+    batch_size = max(1, int(settings.env_setting("STOCKS_BATCH_SIZE", DEFAULT_STOCKS_BATCH_SIZE)))
+    batches = [user_stocks[i:i + batch_size] for i in range(0, len(user_stocks), batch_size)]
 
-                    logger.debug(
-                        f"Получена цена для {stock}: ${stocks_list[-1]['price']}"
-                    )
-                else:
-                    logger.warning(f"Пустой ответ для акции {stock}")
-                    stocks_list.append(
-                        {"stock": stock, "price": 0, "error": "Данные не получены"}
-                    )
-
-            elif response.status_code == 429:
-                logger.warning(f"Превышен лимит запросов для акции {stock}")
-                stocks_list.append(
-                    {"stock": stock, "price": 0, "error": "Превышен лимит запросов API"}
-                )
-                # Делаем паузу перед следующим запросом
-                time.sleep(1)
-
-        except requests.exceptions.Timeout:
-            logger.error(f"Таймаут при запросе акции {stock}")
-            stocks_list.append({"stock": stock, "price": 0})
-
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Ошибка соединения для акции {stock}")
-            stocks_list.append({"stock": stock, "price": 0})
-
-        except Exception as e:
-            logger.error(f"Неизвестная ошибка для акции {stock}: {e}")
-            stocks_list.append({"stock": stock, "price": 0})
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches))))
+    try:
+        futures = [executor.submit(_get_stock_batch, session, batch, request_timeout) for batch in batches]
+
+        # Результаты собираются в порядке настроек; общий дедлайн ограничивает ожидание
+        for batch, future in zip(batches, futures):
+            try:
+                stocks_list.extend(future.result(timeout=max(0.0, deadline_at - time.monotonic())))
+            except FuturesTimeoutError:
+                for stock in batch:
+                    logger.error(f"Истекло общее время ожидания котировки {stock}")
+                    last_known = _quote_cache.peek(f"stock:{stock}") if _quote_cache else None
+                    stocks_list.append(last_known or {"stock": stock, "price": 0, "error": "Истекло время ожидания"})
+    finally:
+        # Не ждем зависшие запросы: их результат уже не попадет в ответ
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # Логируем результат
     successful_stocks = [s for s in stocks_list if s["price"] > 0]
@@ -280,30 +507,61 @@ def get_stock_prices() -> list:
     return stocks_list
 
 
-def create_summary_json(df: pd.DataFrame, target_date: str) -> Dict:
+def _timed(func: Callable[..., T], *args: Any) -> Tuple[T, float]:
+    """
+    Выполняет функцию и измеряет время ее работы
+
+    Args:
+        func: Вызываемая функция
+        args: Аргументы функции
+
+    Returns:
+        Кортеж (результат, время выполнения в миллисекундах)
+    """
+    started = time.perf_counter()
+    result = func(*args)
+    return result, round((time.perf_counter() - started) * 1000, 3)
+
+
+def create_summary_json(df: pd.DataFrame | TransactionStore,
+                        target_date: str,
+                        currency_rates: Optional[Dict[str, float]] = None,
+                        stock_prices: Optional[List[Dict]] = None) -> Dict:
     """
     Создает JSON-ответ с сводной информацией
+    Сетевые разделы (курсы валют и акции) запрашиваются параллельно с расчетами по операциям
 
     Args:
-        df: DataFrame с данными операций
+        df: DataFrame с данными операций или отсортированное хранилище операций
         target_date: Дата в формате 'YYYY-MM-DD HH:MM:SS' для фильтрации
+        currency_rates: Уже полученные курсы валют; если None, курсы запрашиваются
+        stock_prices: Уже полученные цены акций; если None, цены запрашиваются
 
     Returns:
-        Словарь с данными в требуемом формате
+        Словарь с данными в требуемом формате и временем расчета разделов в "meta"
     """
-    # Фильтруем данные по дате
-    try:
-        filtered_df = filter_data_by_date(df, target_date)
-    except Exception as e:
-        logger.error(f"Ошибка при фильтрации данных: {e}")
-        filtered_df = pd.DataFrame(columns=df.columns)
+    started = time.perf_counter()
+    timings = {}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Запускаем сетевые запросы до расчетов, чтобы они шли параллельно
+        currency_future = _section_future(executor, get_currency_rates, currency_rates)
+        stocks_future = _section_future(executor, get_stock_prices, stock_prices)
 
-    # Получаем данные для JSON
-    greeting = time_response()
-    cards = get_card_summary(filtered_df)
-    top_transactions = get_top_transactions(filtered_df)
-    currency_rates_data = get_currency_rates()
-    stock_prices_data = get_stock_prices()
+        # Фильтруем данные по дате
+        try:
+            filtered_df, timings["filter"] = _timed(filter_data_by_date, df, target_date)
+        except Exception as e:
+            logger.error(f"Ошибка при фильтрации данных: {e}")
+            filtered_df = pd.DataFrame(columns=df.columns)
+
+        # Получаем данные для JSON
+        greeting, timings["greeting"] = _timed(time_response)
+        cards, timings["cards"] = _timed(get_card_summary, filtered_df)
+        top_transactions, timings["top_transactions"] = _timed(get_top_transactions, filtered_df)
+
+        currency_rates_data, timings["currency_rates"] = _network_section(currency_future, "курсов валют", {})
+        stock_prices_data, timings["stock_prices"] = _network_section(stocks_future, "цен на акции", [])
 
     # Преобразуем данные в требуемый формат
     result = {
@@ -329,4 +587,25 @@ def create_summary_json(df: pd.DataFrame, target_date: str) -> Dict:
             "rate": rate
         })
 
-    return result
\ No newline at end of file
+    timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+    result["meta"] = {"timings_ms": timings}
+
+    return result
+
+
+def _section_future(executor: ThreadPoolExecutor, fetch: Callable[[], T], prefetched: Optional[T]) -> Future:
+    """Запускает сетевой раздел сводки или возвращает завершенный Future с уже полученными данными"""
+    if prefetched is None:
+        return executor.submit(_timed, fetch)
+    future: Future = Future()
+    future.set_result((prefetched, None))
+    return future
+
+
+def _network_section(future: Future, section_name: str, default: T) -> Tuple[T, Optional[float]]:
+    """Дожидается результата сетевого раздела сводки; при ошибке возвращает значение по умолчанию"""
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"Ошибка при получении {section_name}: {e}")
+        return default, None
@@ -1,9 +1,17 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
 import pandas as pd
 import pytest
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 from src import views
+from src.reports import spending_cache
+from src.http_client import TokenBucket
 
 
 # Фикстуры для тестов модуля views.py
@@ -47,6 +55,76 @@ def mock_user_settings():
     }
 
 
+@pytest.fixture(autouse=True)
+def isolated_stocks_rate_limiter():
+    """Фикстура, изолирующая ограничитель частоты запросов к API котировок между тестами"""
+    with patch('src.views._stocks_rate_limiter', TokenBucket(rate=1000, capacity=1000)):
+        with patch('src.views.STOCKS_BACKOFF', 0.01):
+            yield
+
+
+@pytest.fixture(autouse=True)
+def clear_spending_cache():
+    """Фикстура, очищающая кэш результатов spending_by_category между тестами"""
+    spending_cache.clear()
+    yield
+    spending_cache.clear()
+
+
+@pytest.fixture
+def stub_stocks_server():
+    """Фикстура с локальным HTTP-сервером, имитирующим API котировок
+
+    Ответ на '/quote?symbol=<тикеры через запятую>' - [{"symbol": <тикер>, "price": <цена>}, ...]
+    с задержкой из словаря delays. Тикер из словаря rate_limited получает ответ 429 указанное число раз.
+    """
+
+    class StubServer(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.prices = {}
+            self.delays = {}
+            self.rate_limited = {}
+            self.requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            symbols = parse_qs(urlparse(self.path).query).get("symbol", [""])[0].split(",")
+            self.server.requested.append(",".join(symbols))
+            time.sleep(max(self.server.delays.get(symbol, 0) for symbol in symbols))
+
+            if any(self.server.rate_limited.get(symbol, 0) > 0 for symbol in symbols):
+                for symbol in symbols:
+                    self.server.rate_limited[symbol] = self.server.rate_limited.get(symbol, 0) - 1
+                self.send_response(429)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            quotes = [{"symbol": symbol, "price": self.server.prices.get(symbol, 100.0)} for symbol in symbols]
+            body = json.dumps(quotes).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = StubServer(("127.0.0.1", 0), Handler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/quote?symbol="
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
 
 
 # Фикстуры для тестов модуля services.py
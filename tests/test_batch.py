@@ -0,0 +1,94 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.batch import main, read_requests, summarize_batch, write_jsonl
+from src.transactions import TransactionStore, normalize_transactions
+
+
+@pytest.fixture
+def store(sample_transactions_df):
+    """Хранилище из примерных транзакций"""
+    return TransactionStore(normalize_transactions(sample_transactions_df))
+
+
+def test_read_requests():
+    """Тест разбора запросов: JSON-объекты и просто даты"""
+    lines = ['{"id": 7, "date": "2021-12-31 23:59:59"}\n', "\n", "2021-11-30 12:00:00\n"]
+
+    assert read_requests(lines) == [
+        {"id": 7, "date": "2021-12-31 23:59:59"},
+        {"date": "2021-11-30 12:00:00"},
+    ]
+
+
+def test_read_requests_without_date():
+    """Тест ошибки для запроса без даты"""
+    with pytest.raises(ValueError):
+        read_requests(['{"id": 1}'])
+
+
+def test_summarize_batch_fetches_quotes_once(store):
+    """Тест пакета сводок: котировки запрашиваются один раз на весь пакет"""
+    requests = [{"id": 1, "date": "2021-12-31 23:59:59"}, {"id": 2, "date": "2021-11-30 23:59:59"}]
+
+    with patch("src.batch.get_currency_rates", return_value={"USD": 73.21}) as mock_rates, \
+            patch("src.batch.get_stock_prices", return_value=[{"stock": "AAPL", "price": 150.12}]) as mock_stocks, \
+            patch("src.views.get_currency_rates") as mock_views_rates:
+        results = list(summarize_batch(store, requests))
+
+    assert mock_rates.call_count == 1
+    assert mock_stocks.call_count == 1
+    mock_views_rates.assert_not_called()
+    assert [result["id"] for result in results] == [1, 2]
+    assert results[0]["summary"]["currency_rates"] == [{"currency": "USD", "rate": 73.21}]
+    assert len(results[0]["summary"]["top_transactions"]) == 3
+    assert len(results[1]["summary"]["top_transactions"]) == 1
+
+
+def test_summarize_batch_invalid_date(store):
+    """Тест записи с ошибкой для неверной даты без прерывания пакета"""
+    results = list(summarize_batch(store, [{"date": "31.12.2021"}, {"date": "2021-12-31 23:59:59"}], 1, {}, []))
+
+    assert "error" in results[0] and "summary" not in results[0]
+    assert "summary" in results[1]
+
+
+def test_summarize_batch_process_pool(store):
+    """Тест расчета в пуле процессов: результат совпадает с расчетом в одном процессе"""
+    requests = [{"date": f"2021-12-{day:02d} 23:59:59"} for day in range(25, 32)]
+
+    sequential = list(summarize_batch(store, requests, 1, {}, []))
+    parallel = list(summarize_batch(store, requests, 2, {}, []))
+
+    def strip_meta(results):
+        return [{key: value for key, value in result["summary"].items() if key not in ("meta", "greeting")}
+                for result in results]
+
+    assert strip_meta(parallel) == strip_meta(sequential)
+
+
+def test_write_jsonl():
+    """Тест записи результатов в формате JSON Lines"""
+    output = io.StringIO()
+
+    count = write_jsonl([{"date": "2021-12-31", "summary": {"greeting": "Добрый вечер"}}, {"error": "x"}], output)
+
+    lines = output.getvalue().splitlines()
+    assert count == 2
+    assert json.loads(lines[0])["summary"]["greeting"] == "Добрый вечер"
+    assert json.loads(lines[1]) == {"error": "x"}
+
+
+def test_main_offline(tmp_path, sample_transactions_df):
+    """Тест командной строки: загрузка выписок и запись сводок в файл"""
+    with patch("src.batch.load_statements", return_value=(sample_transactions_df, [])), \
+            patch("src.batch.fetch_quotes") as mock_fetch:
+        main(["--date", "2021-12-31 23:59:59", "--offline", "--output", str(tmp_path / "out.jsonl")])
+
+    mock_fetch.assert_not_called()
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["summary"]["currency_rates"] == []
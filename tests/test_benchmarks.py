@@ -0,0 +1,43 @@
+import pandas as pd
+
+from benchmarks.suite import find_regressions
+from benchmarks.synthetic import COLUMNS, make_statement
+from src.transactions import is_normalized, normalize_transactions
+
+
+def test_make_statement_schema():
+    """Тест синтетической выписки: колонки выгрузки, повторяемость и порядок по убыванию даты"""
+    df = make_statement(500, seed=1)
+
+    assert list(df.columns) == COLUMNS
+    assert not is_normalized(df)
+    pd.testing.assert_frame_equal(df, make_statement(500, seed=1))
+    dates = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    assert dates.is_monotonic_decreasing
+    assert (df["Сумма операции"] < 0).any() and (df["Сумма операции"] > 0).any()
+    assert df["Номер карты"].isna().any()
+
+
+def test_make_statement_canonical_matches_normalized():
+    """Тест канонического режима: результат совпадает с normalize_transactions выгрузки"""
+    pd.testing.assert_frame_equal(
+        make_statement(300, seed=2, canonical=True),
+        normalize_transactions(make_statement(300, seed=2)),
+    )
+
+
+def test_find_regressions():
+    """Тест сравнения замеров с базовыми: допуск по времени и памяти, новые замеры не проверяются"""
+    baseline = {"10k": {"fast": {"seconds": 0.010, "peak_mb": 10.0}, "small": {"seconds": 0.001, "peak_mb": 0.1}}}
+    results = {"10k": {
+        "fast": {"seconds": 0.014, "peak_mb": 12.0},
+        "small": {"seconds": 0.001, "peak_mb": 0.9},
+        "new": {"seconds": 1.0, "peak_mb": 100.0},
+    }}
+
+    assert find_regressions(results, baseline) == []
+
+    results["10k"]["fast"] = {"seconds": 0.020, "peak_mb": 13.0}
+    regressions = find_regressions(results, baseline)
+    assert len(regressions) == 2
+    assert all(regression.startswith("10k fast") for regression in regressions)
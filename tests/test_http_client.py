@@ -0,0 +1,137 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.http_client import RequestCoalescer, TokenBucket, get_with_retry
+
+
+def _response(status_code, headers=None):
+    """Создает мок ответа с кодом и заголовками"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+# Тесты для TokenBucket
+def test_token_bucket_limits_rate():
+    """Тест ожидания токенов после исчерпания запаса"""
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    started = time.monotonic()
+    for _ in range(3):
+        assert bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.09
+
+
+def test_token_bucket_timeout():
+    """Тест отказа при недостаточном времени ожидания"""
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.1)
+
+
+def test_token_bucket_rate_below_one():
+    """Тест корзины с лимитом меньше одного запроса в секунду и емкостью 1"""
+    bucket = TokenBucket(rate=0.5, capacity=max(1.0, 0.5))
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+
+@pytest.mark.parametrize("rate, capacity", [(0, 1), (-1, 1), (0.5, 0.5)])
+def test_token_bucket_invalid_parameters(rate, capacity):
+    """Тест отказа от корзины, в которой токен никогда не появится"""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=rate, capacity=capacity)
+
+
+# Тесты для RequestCoalescer
+def test_request_coalescer_shares_inflight_result():
+    """Тест объединения одновременных вызовов с одним ключом"""
+    coalescer = RequestCoalescer()
+    calls = []
+
+    def slow_request():
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(coalescer.run("key", slow_request))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+
+
+def test_request_coalescer_propagates_error():
+    """Тест передачи исключения вызывающему и очистки ключа"""
+    coalescer = RequestCoalescer()
+
+    with pytest.raises(ValueError):
+        coalescer.run("key", MagicMock(side_effect=ValueError("error")))
+
+    assert coalescer.run("key", lambda: "ok") == "ok"
+
+
+# Тесты для get_with_retry
+def test_get_with_retry_retries_on_429():
+    """Тест повтора запроса после ответа 429"""
+    session = MagicMock()
+    session.get.side_effect = [_response(429, {"Retry-After": "0"}), _response(200)]
+
+    response = get_with_retry(session, "http://example", timeout=1, retries=2, backoff=0)
+
+    assert response.status_code == 200
+    assert session.get.call_count == 2
+
+
+def test_get_with_retry_caps_retry_after(monkeypatch):
+    """Тест ограничения паузы из Retry-After таймаутом запроса"""
+    sleeps = []
+    monkeypatch.setattr("src.http_client.time.sleep", sleeps.append)
+    session = MagicMock()
+    session.get.side_effect = [_response(429, {"Retry-After": "3600"}), _response(200)]
+
+    response = get_with_retry(session, "http://example", timeout=2, retries=1, backoff=0)
+
+    assert response.status_code == 200
+    assert sleeps == [2]
+
+
+def test_get_with_retry_returns_last_response():
+    """Тест возврата последнего ответа после исчерпания повторов"""
+    session = MagicMock()
+    session.get.return_value = _response(503)
+
+    response = get_with_retry(session, "http://example", timeout=1, retries=2, backoff=0)
+
+    assert response.status_code == 503
+    assert session.get.call_count == 3
+
+
+def test_get_with_retry_connection_error():
+    """Тест повтора при ошибке соединения и проброса последней ошибки"""
+    session = MagicMock()
+    session.get.side_effect = requests.exceptions.ConnectionError
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        get_with_retry(session, "http://example", timeout=1, retries=1, backoff=0)
+    assert session.get.call_count == 2
+
+
+def test_get_with_retry_rate_limiter_timeout():
+    """Тест таймаута при ожидании токена ограничителя"""
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.acquire()
+
+    with pytest.raises(requests.exceptions.Timeout):
+        get_with_retry(MagicMock(), "http://example", timeout=0.05, limiter=bucket)
@@ -0,0 +1,242 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from src import loader
+from src.loader import OperationsArchive, load_operations, read_cache, write_cache
+from src.transactions import normalize_transactions
+
+
+@pytest.fixture
+def operations_xlsx(tmp_path, sample_transactions_df):
+    """Фикстура с Excel-файлом операций во временной директории"""
+    df = sample_transactions_df.copy()
+    df.loc[1, "Номер карты"] = np.nan
+    df["Бонусы (включая кэшбэк)"] = [3, 5, 0, 0, 72]
+    path = tmp_path / "operations.xlsx"
+    df.to_excel(path, sheet_name=loader.OPERATIONS_SHEET_NAME, index=False)
+    return path
+
+
+def test_load_operations_creates_cache(operations_xlsx, tmp_path):
+    """Тест создания кэша при первой загрузке"""
+    cache_dir = tmp_path / "cache"
+    df = load_operations(operations_xlsx, cache_dir=cache_dir)
+
+    assert len(df) == 5
+    assert len(list(cache_dir.glob("operations.*.npz"))) == 1
+
+
+def test_load_operations_reads_cache(operations_xlsx, tmp_path):
+    """Тест повторной загрузки без разбора Excel"""
+    cache_dir = tmp_path / "cache"
+    expected = load_operations(operations_xlsx, cache_dir=cache_dir)
+
+    with patch("src.loader.pd.read_excel") as mock_read_excel:
+        result = load_operations(operations_xlsx, cache_dir=cache_dir)
+        mock_read_excel.assert_not_called()
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert pd.isna(result.loc[1, "Номер карты"])
+    assert result["Бонусы (включая кэшбэк)"].dtype == np.int64
+
+
+def test_load_operations_invalidates_cache(operations_xlsx, tmp_path, sample_transactions_df):
+    """Тест сброса кэша при изменении исходного файла"""
+    cache_dir = tmp_path / "cache"
+    load_operations(operations_xlsx, cache_dir=cache_dir)
+
+    sample_transactions_df.head(2).to_excel(operations_xlsx, sheet_name=loader.OPERATIONS_SHEET_NAME, index=False)
+    stat = operations_xlsx.stat()
+    os.utime(operations_xlsx, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    result = load_operations(operations_xlsx, cache_dir=cache_dir)
+
+    assert len(result) == 2
+    # Устаревший файл кэша удален
+    assert len(list(cache_dir.glob("operations.*.npz"))) == 1
+
+
+def test_load_operations_without_cache(operations_xlsx, tmp_path):
+    """Тест загрузки с отключенным кэшем"""
+    result = load_operations(operations_xlsx, cache_dir=None)
+    assert len(result) == 5
+    assert not (tmp_path / "cache").exists()
+
+
+def test_write_cache_unsupported_column(tmp_path):
+    """Тест отказа от кэширования колонок неподдерживаемого типа"""
+    df = pd.DataFrame({"Дата операции": [pd.Timestamp("2021-12-31"), "31.12.2021"]})
+    cache_path = tmp_path / "operations.npz"
+
+    assert write_cache(df, cache_path) is False
+    assert not cache_path.exists()
+
+
+def test_write_and_read_cache_roundtrip(sample_transactions_df, tmp_path):
+    """Тест сохранения типов и пропусков при записи и чтении кэша"""
+    df = sample_transactions_df.copy()
+    df.loc[0, "Описание"] = None
+    cache_path = tmp_path / "operations.npz"
+
+    assert write_cache(df, cache_path)
+    result = read_cache(cache_path)
+
+    assert list(result.columns) == list(df.columns)
+    assert pd.isna(result.loc[0, "Описание"])
+    assert result["Сумма операции"].tolist() == df["Сумма операции"].tolist()
+
+
+# Тесты накопительного архива операций
+def test_archive_ingest_skips_known_operations(operations_xlsx, tmp_path, sample_transactions_df):
+    """Тест добавления в архив только новых операций"""
+    archive = OperationsArchive(tmp_path / "archive")
+    assert archive.ingest(operations_xlsx) == len(sample_transactions_df)
+    assert archive.ingest(operations_xlsx) == 0
+    assert len(archive.segments) == 1
+
+    new_export = pd.read_excel(operations_xlsx, sheet_name=loader.OPERATIONS_SHEET_NAME)
+    new_export.loc[0, "Описание"] = "Новая операция"
+    assert archive.ingest_frame(new_export) == 1
+    assert len(archive.segments) == 2
+    assert len(archive.store) == len(sample_transactions_df) + 1
+
+
+def test_archive_reloads_segments(operations_xlsx, tmp_path, sample_transactions_df):
+    """Тест загрузки архива из сохраненных сегментов"""
+    archive = OperationsArchive(tmp_path / "archive")
+    archive.ingest(operations_xlsx)
+    archive.ingest_frame(sample_transactions_df.assign(**{"Сумма операции": -1.0}))
+
+    reloaded = OperationsArchive(tmp_path / "archive")
+    assert len(reloaded.store) == len(archive.store)
+    pd.testing.assert_frame_equal(reloaded.store.aggregates("category"), archive.store.aggregates("category"))
+    assert reloaded.ingest(operations_xlsx) == 0
+
+
+def test_archive_ingest_canonical_frame(tmp_path, sample_transactions_df):
+    """Тест архива: канонический DataFrame сохраняется в сегмент и читается после перезапуска"""
+    archive = OperationsArchive(tmp_path / "archive")
+    assert archive.ingest_frame(normalize_transactions(sample_transactions_df.head(3))) == 3
+    assert len(archive.segments) == 1
+
+    # Уже сохраненные операции в выгрузке не дублируются, остальные дописываются
+    assert archive.ingest_frame(sample_transactions_df) == 2
+
+    reloaded = OperationsArchive(tmp_path / "archive")
+    assert len(reloaded.store) == len(sample_transactions_df)
+    pd.testing.assert_frame_equal(reloaded.store.aggregates("card"), archive.store.aggregates("card"))
+    assert reloaded.ingest_frame(sample_transactions_df) == 0
+
+
+def test_archive_ingest_unsupported_frame_keeps_store(tmp_path, sample_transactions_df):
+    """Тест архива: если сегмент не записан, операции не попадают в хранилище"""
+    archive = OperationsArchive(tmp_path / "archive")
+    df = sample_transactions_df.assign(**{"Статус": [1, "OK", "OK", "OK", "OK"]})
+
+    with pytest.raises(ValueError):
+        archive.ingest_frame(df)
+
+    assert archive.segments == []
+    assert len(archive.store) == 0
+    assert archive.ingest_frame(sample_transactions_df) == len(sample_transactions_df)
+
+
+def test_write_and_read_cache_canonical(sample_transactions_df, tmp_path):
+    """Тест кэша для канонического DataFrame: даты и категориальные колонки сохраняют тип"""
+    df = normalize_transactions(sample_transactions_df)
+    cache_path = tmp_path / "operations.npz"
+
+    assert write_cache(df, cache_path)
+    pd.testing.assert_frame_equal(read_cache(cache_path), df)
+
+
+# Тесты потокового чтения выгрузки
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_iter_operations_chunks(operations_xlsx, chunk_size):
+    """Тест чтения выгрузки частями с приведением типов"""
+    chunks = list(loader.iter_operations_chunks(operations_xlsx, chunk_size=chunk_size))
+    expected = pd.read_excel(operations_xlsx, sheet_name=loader.OPERATIONS_SHEET_NAME)
+
+    assert [len(chunk) for chunk in chunks] == [
+        min(chunk_size, len(expected) - start) for start in range(0, len(expected), chunk_size)
+    ]
+    result = pd.concat(chunks, ignore_index=True)
+    assert pd.api.types.is_datetime64_any_dtype(result["Дата операции"])
+    assert result["Сумма операции"].tolist() == expected["Сумма операции"].tolist()
+    assert result["Описание"].tolist() == expected["Описание"].tolist()
+
+
+def test_iter_operations_chunks_empty_sheet(tmp_path):
+    """Тест чтения пустого листа"""
+    path = tmp_path / "empty.xlsx"
+    pd.DataFrame().to_excel(path, sheet_name=loader.OPERATIONS_SHEET_NAME, index=False)
+
+    assert list(loader.iter_operations_chunks(path)) == []
+
+
+# Тесты загрузки директории выписок
+@pytest.fixture
+def statements_dir(tmp_path, operations_xlsx):
+    """Фикстура с директорией выписок по счетам, кэшем и поврежденным файлом"""
+    root = tmp_path / "statements"
+    for relative in ("account_1/2021-11.xlsx", "account_2/2021-12.xlsx", ".cache/copy.xlsx"):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(operations_xlsx.read_bytes())
+    (root / "account_2" / "broken.xlsx").write_text("not an excel file")
+    (root / "account_2" / "~$2021-12.xlsx").write_text("lock")
+    return root
+
+
+def test_discover_statement_files(statements_dir):
+    """Тест поиска выписок без скрытых директорий и временных файлов"""
+    files = loader.discover_statement_files(statements_dir)
+
+    assert [path.relative_to(statements_dir).as_posix() for path in files] == [
+        "account_1/2021-11.xlsx",
+        "account_2/2021-12.xlsx",
+        "account_2/broken.xlsx",
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_statements(statements_dir, sample_transactions_df, max_workers):
+    """Тест объединения выписок и отчета по файлам"""
+    df, report = loader.load_statements(statements_dir, cache_dir=None, max_workers=max_workers)
+
+    assert len(df) == 2 * len(sample_transactions_df)
+    assert pd.api.types.is_datetime64_any_dtype(df["Дата операции"])
+    assert [item["rows"] for item in report] == [5, 5, 0]
+    assert all(item["seconds"] >= 0 for item in report)
+    assert report[0]["error"] is None
+    assert report[2]["error"] is not None
+
+
+def test_load_statements_same_names_keep_caches(tmp_path, operations_xlsx):
+    """Тест кэша для выписок с одинаковыми именами в разных директориях"""
+    root = tmp_path / "statements"
+    for relative in ("account_1/2021-12.xlsx", "account_2/2021-12.xlsx", "account_2/2021-12.old.xlsx"):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(operations_xlsx.read_bytes())
+    cache_dir = tmp_path / "cache"
+
+    loader.load_statements(root, cache_dir=cache_dir, max_workers=1)
+    assert len(list(cache_dir.glob("*.npz"))) == 3
+
+    with patch("src.loader.pd.read_excel") as mock_read_excel:
+        df, report = loader.load_statements(root, cache_dir=cache_dir, max_workers=1)
+        mock_read_excel.assert_not_called()
+
+    assert [item["rows"] for item in report] == [5, 5, 5]
+    assert len(list(cache_dir.glob("*.npz"))) == 3
+
+
+def test_load_statements_without_files(tmp_path):
+    """Тест ошибки при отсутствии выписок"""
+    with pytest.raises(FileNotFoundError):
+        loader.load_statements(tmp_path)
@@ -0,0 +1,117 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from src import views
+from src.quote_cache import QuoteCache
+
+
+def test_quote_cache_returns_fresh_value():
+    """Тест выдачи свежего значения без повторного запроса"""
+    cache = QuoteCache(ttl=60)
+    fetch = MagicMock(return_value={"USD": 91.5})
+
+    assert cache.get_or_fetch("rates", fetch) == {"USD": 91.5}
+    assert cache.get_or_fetch("rates", fetch) == {"USD": 91.5}
+    fetch.assert_called_once()
+
+
+def test_quote_cache_stale_while_revalidate():
+    """Тест выдачи устаревшего значения с обновлением в фоне"""
+    cache = QuoteCache(ttl=0, stale_ttl=60)
+    cache.set("rates", {"USD": 91.5})
+
+    result = cache.get_or_fetch("rates", lambda: {"USD": 92.0})
+    assert result == {"USD": 91.5}
+
+    cache.wait_refreshes(timeout=5)
+    assert cache.peek("rates") == {"USD": 92.0}
+
+
+def test_quote_cache_fallback_to_last_known():
+    """Тест возврата последнего известного значения при ошибке API"""
+    cache = QuoteCache(ttl=0, stale_ttl=0)
+    cache.set("rates", {"USD": 91.5})
+
+    assert cache.get_or_fetch("rates", lambda: {}) == {"USD": 91.5}
+
+
+def test_quote_cache_does_not_store_invalid_value():
+    """Тест отказа от кэширования некорректного значения"""
+    cache = QuoteCache(ttl=60)
+
+    assert cache.get_or_fetch("rates", lambda: {}) == {}
+    assert cache.peek("rates") is None
+
+
+def test_quote_cache_lru_eviction():
+    """Тест вытеснения давно неиспользуемых записей"""
+    cache = QuoteCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get_or_fetch("a", lambda: 10)
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.peek("b") is None
+    assert cache.peek("a") == 1
+
+
+def test_quote_cache_persistence(tmp_path):
+    """Тест сохранения кэша в файл и загрузки при создании"""
+    persist_path = tmp_path / "quotes.json"
+    QuoteCache(persist_path=persist_path).set("stock:AAPL", {"stock": "AAPL", "price": 150.25})
+
+    with open(persist_path, "r", encoding="utf-8") as f:
+        assert "stock:AAPL" in json.load(f)
+
+    restored = QuoteCache(persist_path=persist_path)
+    assert restored.peek("stock:AAPL") == {"stock": "AAPL", "price": 150.25}
+
+
+def test_quote_cache_broken_persist_file(tmp_path):
+    """Тест запуска с поврежденным файлом кэша"""
+    persist_path = tmp_path / "quotes.json"
+    persist_path.write_text("{", encoding="utf-8")
+
+    assert len(QuoteCache(persist_path=persist_path)) == 0
+
+
+# Тесты подключения кэша к views
+def test_get_currency_rates_uses_last_known_on_error(mock_user_settings):
+    """Тест курсов валют из кэша при ошибке соединения"""
+    cache = QuoteCache(ttl=0, stale_ttl=0)
+    cache.set("currency_rates:USD,EUR", {"USD": 91.5, "EUR": 100.2})
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch('src.views._quote_cache', cache):
+            with patch('src.views.requests.get', side_effect=views.requests.exceptions.ConnectionError):
+                assert views.get_currency_rates() == {"USD": 91.5, "EUR": 100.2}
+
+
+def test_get_stock_prices_uses_cache(mock_user_settings):
+    """Тест получения котировок из кэша без запросов к API"""
+    cache = QuoteCache(ttl=60)
+    for stock, price in [("AAPL", 150.25), ("AMZN", 175.5), ("GOOGL", 140.0)]:
+        cache.set(f"stock:{stock}", {"stock": stock, "price": price})
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch('src.views._quote_cache', cache):
+            with patch('src.views.requests.Session.get') as mock_get:
+                result = views.get_stock_prices()
+                mock_get.assert_not_called()
+
+    assert [item["price"] for item in result] == [150.25, 175.5, 140.0]
+
+
+def test_get_stock_prices_fallback_on_timeout(mock_user_settings):
+    """Тест последней известной котировки при таймауте API"""
+    cache = QuoteCache(ttl=0, stale_ttl=0)
+    cache.set("stock:AAPL", {"stock": "AAPL", "price": 150.25})
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch('src.views._quote_cache', cache):
+            with patch('src.views.requests.Session.get', side_effect=views.requests.exceptions.Timeout):
+                result = views.get_stock_prices()
+
+    assert result[0] == {"stock": "AAPL", "price": 150.25}
+    assert result[1]["price"] == 0
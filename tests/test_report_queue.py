@@ -0,0 +1,106 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src import reports
+from src.report_queue import BackgroundReportWriter
+from src.reports import report_writer, set_report_queue
+
+
+@pytest.fixture
+def report_queue():
+    """Фоновая запись отчетов, подключенная к report_writer на время теста"""
+    writer = BackgroundReportWriter(max_queue=4)
+    set_report_queue(writer)
+    yield writer
+    set_report_queue(None)
+    writer.close()
+
+
+def test_report_writer_returns_before_write(report_queue, tmp_path):
+    """Тест возврата результата до окончания записи файла"""
+    file_name = tmp_path / "report.json"
+    release = threading.Event()
+    original_write = reports.write_report
+
+    def slow_write(*args, **kwargs):
+        release.wait(5)
+        original_write(*args, **kwargs)
+
+    @report_writer(filename=str(file_name))
+    def test_func():
+        return {"value": 1}
+
+    with patch("src.report_queue.write_report", side_effect=slow_write):
+        assert test_func() == {"value": 1}
+        assert not file_name.exists()
+
+        release.set()
+        assert report_queue.flush(timeout=5)
+
+    with open(file_name, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    assert report["report_name"] == "test_func"
+    assert report["data"] == {"value": 1}
+
+
+def test_last_write_wins(report_queue, tmp_path):
+    """Тест, что в файле остается последний отправленный отчет"""
+    file_name = tmp_path / "report.json"
+
+    @report_writer(filename=str(file_name))
+    def test_func(value):
+        return pd.DataFrame({"value": [value]})
+
+    for value in range(20):
+        test_func(value)
+    report_queue.flush()
+
+    with open(file_name, 'r', encoding='utf-8') as f:
+        assert json.load(f)["data"] == [{"value": 19}]
+
+
+def test_superseded_reports_are_skipped(tmp_path):
+    """Тест пропуска отчетов, для файла которых в очереди есть более новый"""
+    release = threading.Event()
+    file_name = str(tmp_path / "report.json")
+    written = []
+
+    def record_write(result, *args):
+        release.wait(5)
+        written.append(result)
+
+    with patch("src.report_queue.write_report", side_effect=record_write):
+        with BackgroundReportWriter(max_queue=8) as writer:
+            writer.submit("first", file_name, "report")
+            writer.submit("second", file_name, "report")
+            writer.submit("third", file_name, "report")
+            release.set()
+
+    assert written[-1] == "third"
+    assert "second" not in written
+
+
+def test_close_writes_pending_reports(tmp_path):
+    """Тест записи оставшихся отчетов при остановке"""
+    writer = BackgroundReportWriter()
+    for i in range(5):
+        writer.submit({"i": i}, str(tmp_path / f"report_{i}.json"), "report")
+    writer.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"report_{i}.json" for i in range(5)]
+    with pytest.raises(RuntimeError):
+        writer.submit({}, str(tmp_path / "late.json"), "report")
+
+
+def test_write_errors_do_not_stop_worker(tmp_path):
+    """Тест продолжения работы после ошибки записи"""
+    with BackgroundReportWriter() as writer:
+        writer.submit({}, str(tmp_path / "missing" / "report.json"), "report")
+        writer.submit({"ok": True}, str(tmp_path / "report.json"), "report")
+        assert writer.flush(timeout=5)
+
+    assert (tmp_path / "report.json").exists()
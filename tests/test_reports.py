@@ -4,7 +4,9 @@ from datetime import datetime, timedelta
 import json
 import os
 from unittest.mock import patch, mock_open
-from src.reports import report_writer, spending_by_category
+from src import reports
+from src.transactions import TransactionStore
+from src.reports import report_writer, spending_by_categories, spending_by_category, write_dataframe_json
 
 
 def test_spending_by_category_basic_filtering(sample_transactions_df):
@@ -168,3 +170,335 @@ def test_spending_by_category_reset_index(extended_sample_transaction_df):
     # Проверяем, что индекс сброшен и начинается с 0
     assert list(result.index) == [0]
 
+
+
+# Тесты потоковой записи DataFrame
+@pytest.mark.parametrize("chunk_size", [1, 2, 10_000])
+def test_write_dataframe_json_matches_json_dump(sample_transactions_df, tmp_path, chunk_size):
+    """Тест совпадения потоковой записи с json.dump(..., indent=2)"""
+    df = sample_transactions_df.copy()
+    df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    df.loc[1, "Сумма платежа"] = float("nan")
+    df.loc[2, "Описание"] = None
+    df["Бонусы"] = [1, 2, 3, 4, 5]
+    df["Кэшбэк"] = [True, False, True, False, True]
+    temp_file = tmp_path / "report.json"
+
+    write_dataframe_json(df, str(temp_file), "report", "2021-12-31T00:00:00", chunk_size=chunk_size)
+
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    for record in records:
+        record["Дата операции"] = record["Дата операции"].isoformat()
+    expected = json.dumps(
+        {"report_name": "report", "generated_at": "2021-12-31T00:00:00", "data": records},
+        ensure_ascii=False,
+        indent=2,
+    )
+    assert temp_file.read_text(encoding="utf-8") == expected
+
+
+def test_write_dataframe_json_empty(tmp_path):
+    """Тест потоковой записи пустого DataFrame"""
+    temp_file = tmp_path / "report.json"
+    write_dataframe_json(pd.DataFrame(columns=["a"]), str(temp_file), "report", "now")
+
+    with open(temp_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {"report_name": "report", "generated_at": "now", "data": []}
+
+
+def test_write_dataframe_json_serializes_by_chunks(extended_sample_transaction_df, tmp_path):
+    """Тест сериализации DataFrame частями ограниченного размера"""
+    temp_file = tmp_path / "report.json"
+
+    with patch("src.reports._encode_records", wraps=reports._encode_records) as mock_encode:
+        write_dataframe_json(extended_sample_transaction_df, str(temp_file), "report", "now", chunk_size=4)
+
+    assert [len(call.args[0]) for call in mock_encode.call_args_list] == [4, 2]
+    with open(temp_file, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)["data"]) == 6
+
+
+# Тесты форматов отчетов
+@pytest.mark.parametrize("chunk_size", [1, 10_000])
+def test_write_dataframe_json_compact_matches_json_dump(sample_transactions_df, tmp_path, chunk_size):
+    """Тест совпадения компактной записи с json.dump(..., separators=(',', ':'))"""
+    df = sample_transactions_df.copy()
+    df.loc[1, "Сумма платежа"] = float("nan")
+    df["Теги"] = [{"a": [1, 2]}, None, [3], {}, "x"]
+    temp_file = tmp_path / "report.json"
+
+    write_dataframe_json(df, str(temp_file), "report", "now", chunk_size=chunk_size, compact=True)
+
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    expected = json.dumps(
+        {"report_name": "report", "generated_at": "now", "data": records},
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    assert temp_file.read_text(encoding="utf-8") == expected
+
+
+def test_report_writer_jsonl(sample_transactions_df, tmp_path):
+    """Тест записи отчета в JSON Lines с файлом метаданных"""
+    file_name = str(tmp_path / "report")
+
+    @report_writer(filename=file_name, output_format="jsonl")
+    def test_func():
+        return sample_transactions_df
+
+    test_func()
+
+    with open(f"{file_name}.jsonl", 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(sample_transactions_df)
+    assert json.loads(lines[0]) == sample_transactions_df.iloc[0].to_dict()
+
+    with open(tmp_path / "report.meta.json", 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    assert metadata["report_name"] == "test_func"
+    assert metadata["format"] == "jsonl"
+    assert metadata["rows"] == len(sample_transactions_df)
+
+
+def test_report_writer_csv(sample_transactions_df, tmp_path):
+    """Тест записи отчета в CSV"""
+    file_name = str(tmp_path / "report.csv")
+
+    @report_writer(filename=file_name, output_format="csv")
+    def test_func():
+        return sample_transactions_df
+
+    test_func()
+
+    result = pd.read_csv(file_name)
+    assert list(result.columns) == list(sample_transactions_df.columns)
+    assert result["Сумма операции"].tolist() == sample_transactions_df["Сумма операции"].tolist()
+    assert (tmp_path / "report.meta.json").exists()
+
+
+def test_report_writer_csv_from_list_of_dicts(tmp_path):
+    """Тест записи списка словарей в табличный формат"""
+    file_name = str(tmp_path / "report.csv")
+
+    @report_writer(filename=file_name, output_format="csv")
+    def test_func():
+        return [{"date": datetime(2021, 12, 1), "value": 1}, {"date": datetime(2021, 12, 2), "value": 2}]
+
+    test_func()
+
+    result = pd.read_csv(file_name)
+    assert result["date"].tolist() == ["2021-12-01T00:00:00", "2021-12-02T00:00:00"]
+    assert result["value"].tolist() == [1, 2]
+
+
+def test_report_writer_parquet(sample_transactions_df, tmp_path):
+    """Тест записи отчета в Parquet с метаданными в файле"""
+    pytest.importorskip("pyarrow")
+    file_name = str(tmp_path / "report")
+
+    @report_writer(filename=file_name, output_format="parquet")
+    def test_func():
+        return sample_transactions_df
+
+    test_func()
+
+    result = pd.read_parquet(f"{file_name}.parquet")
+    pd.testing.assert_frame_equal(result, sample_transactions_df)
+    assert result.attrs["report_name"] == "test_func"
+
+
+def test_report_writer_parquet_without_engine():
+    """Тест ошибки при объявлении отчета в Parquet без установленного движка"""
+    with patch("src.reports.importlib.util.find_spec", return_value=None):
+        with pytest.raises(ImportError):
+            report_writer(output_format="parquet")
+
+
+def test_report_writer_unknown_format():
+    """Тест ошибки при неизвестном формате отчета"""
+    with pytest.raises(ValueError):
+        report_writer(output_format="xml")
+
+
+# Тесты кэша результатов spending_by_category
+def test_spending_by_category_cached(extended_sample_transaction_df):
+    """Тест повторного запроса к хранилищу из кэша без отбора операций"""
+    store = TransactionStore(extended_sample_transaction_df)
+    first = spending_by_category(store, "Супермаркеты", "31.12.2021")
+
+    with patch("src.reports._period_expenses") as mock_expenses:
+        second = spending_by_category(store, "Супермаркеты", "31.12.2021")
+
+    mock_expenses.assert_not_called()
+    pd.testing.assert_frame_equal(first, second)
+    assert reports.spending_cache.hits == 1
+
+
+def test_spending_by_category_cache_invalidated_on_append(extended_sample_transaction_df):
+    """Тест пересчета после добавления операций в хранилище"""
+    store = TransactionStore(extended_sample_transaction_df)
+    first = spending_by_category(store, "Супермаркеты", "31.12.2021")
+
+    new_operation = extended_sample_transaction_df[extended_sample_transaction_df["Категория"] == "Супермаркеты"]
+    store.append(new_operation.tail(1).assign(**{"Описание": "Новая операция"}))
+    second = spending_by_category(store, "Супермаркеты", "31.12.2021")
+
+    assert reports.spending_cache.hits == 0
+    assert len(second) == len(first) + 1
+
+
+def test_spending_by_category_without_date_not_cached(extended_sample_transaction_df):
+    """Тест запросов без даты: период зависит от текущего времени, результат не кэшируется"""
+    store = TransactionStore(extended_sample_transaction_df)
+    reports.spending_cache.clear()
+
+    for _ in range(3):
+        spending_by_category(store, "Супермаркеты")
+
+    assert len(reports.spending_cache) == 0
+
+
+def test_spending_by_category_dataframe_not_cached(extended_sample_transaction_df):
+    """Тест, что для DataFrame отпечаток не вычисляется и кэш не используется"""
+    with patch("src.transactions.data_fingerprint") as mock_fingerprint:
+        spending_by_category(extended_sample_transaction_df, "Супермаркеты", "31.12.2021")
+        spending_by_category(extended_sample_transaction_df, "Супермаркеты", "31.12.2021")
+
+    mock_fingerprint.assert_not_called()
+    assert reports.spending_cache.hits == 0
+    assert reports.spending_cache.misses == 0
+
+
+def test_spending_by_category_cache_returns_copy(extended_sample_transaction_df):
+    """Тест, что изменение результата не портит кэш"""
+    store = TransactionStore(extended_sample_transaction_df)
+    first = spending_by_category(store, "Супермаркеты", "31.12.2021")
+    first["Сумма операции"] = 0.0
+
+    second = spending_by_category(store, "Супермаркеты", "31.12.2021")
+    assert (second["Сумма операции"] < 0).all()
+
+
+def test_result_cache_eviction():
+    """Тест вытеснения по числу записей и суммарному числу строк"""
+    cache = reports.ResultCache(max_entries=2, max_rows=5)
+    cache.set("a", pd.DataFrame({"x": [1]}))
+    cache.set("b", pd.DataFrame({"x": [1, 2]}))
+    cache.get("a")
+    cache.set("c", pd.DataFrame({"x": [1]}))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    cache.set("d", pd.DataFrame({"x": [1, 2, 3, 4]}))
+    assert cache.get("c") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+
+    cache.set("e", pd.DataFrame({"x": range(6)}))
+    assert cache.get("e") is None
+
+
+# Тесты отчета по всем категориям
+def test_spending_by_categories_totals(extended_sample_transaction_df, tmp_path, monkeypatch):
+    """Тест сумм и количества расходов по всем категориям"""
+    monkeypatch.chdir(tmp_path)
+    result = spending_by_categories(extended_sample_transaction_df, "01.01.2022")
+
+    assert list(result.columns) == ["Категория", "Сумма расходов", "Количество операций"]
+    assert list(result["Категория"]) == ["Медицина", "Различные товары", "Супермаркеты", "Каршеринг"]
+    assert result["Сумма расходов"].tolist() == pytest.approx([7240.00, 564.00, 340.66, 7.07])
+    assert result["Количество операций"].tolist() == [1, 1, 2, 1]
+
+    with open(tmp_path / "report_categories.json", 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    assert report["report_name"] == "spending_by_categories"
+    assert len(report["data"]) == 4
+
+
+@pytest.mark.parametrize("date", ["31.12.2021", "01.01.2022", "06.12.2021"])
+def test_spending_by_categories_matches_per_category(extended_sample_transaction_df, tmp_path, monkeypatch, date):
+    """Тест совпадения с отдельными вызовами spending_by_category"""
+    monkeypatch.chdir(tmp_path)
+    result = spending_by_categories(extended_sample_transaction_df, date, include_transactions=True)
+
+    for _, row in result.iterrows():
+        expected = spending_by_category(extended_sample_transaction_df, row["Категория"], date)
+        assert row["Количество операций"] == len(expected)
+        assert row["Сумма расходов"] == pytest.approx(abs(expected["Сумма операции"].sum()))
+        assert [record["Описание"] for record in row["Операции"]] == expected["Описание"].tolist()
+        assert [record["Дата операции"] for record in row["Операции"]] == [
+            value.isoformat() for value in expected["Дата операции"]
+        ]
+
+
+def test_spending_by_categories_store(extended_sample_transaction_df, tmp_path, monkeypatch):
+    """Тест отчета по всем категориям для хранилища операций"""
+    monkeypatch.chdir(tmp_path)
+    expected = spending_by_categories(extended_sample_transaction_df, "01.01.2022")
+    result = spending_by_categories(TransactionStore(extended_sample_transaction_df), "01.01.2022")
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_spending_by_categories_empty(empty_transactions_df, tmp_path, monkeypatch):
+    """Тест отчета по всем категориям без расходов"""
+    monkeypatch.chdir(tmp_path)
+    result = spending_by_categories(empty_transactions_df, "01.01.2022", include_transactions=True)
+
+    assert result.empty
+    assert "Категория" in result.columns
+
+
+# Тесты отбора операций без копирования исходных данных
+def test_spending_by_category_does_not_modify_input(sample_transactions_df):
+    """Тест, что исходный DataFrame не изменяется"""
+    original = sample_transactions_df.copy()
+    result = spending_by_category(sample_transactions_df, "Медицина", "31.12.2021")
+
+    pd.testing.assert_frame_equal(sample_transactions_df, original)
+    assert pd.api.types.is_datetime64_any_dtype(result["Дата операции"])
+
+
+def test_spending_by_category_peak_memory_near_result_size():
+    """Тест, что пик выделенной памяти мал по сравнению с исходными данными"""
+    import tracemalloc
+    import numpy as np
+    from src.transactions import normalize_transactions
+
+    rows = 200_000
+    rng = np.random.default_rng(0)
+    df = normalize_transactions(pd.DataFrame({
+        "Дата операции": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 730 * 86400, rows), unit="s"),
+        "Номер карты": rng.choice(["*7197", "*5091"], rows),
+        "Сумма операции": rng.normal(-500, 800, rows).round(2),
+        "Категория": rng.choice(["Супермаркеты", "Медицина", "Каршеринг"], rows),
+        "Описание": rng.choice(["Колхоз", "Дикси"], rows),
+    }))
+    data_size = df.memory_usage(deep=True).sum()
+
+    with patch("src.reports.write_report"):
+        tracemalloc.start()
+        result = spending_by_category(df, "Медицина", "31.12.2021")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert len(result) > 0
+    assert peak < data_size * 0.2
+
+
+# Тесты отчетов по данным, поступающим частями
+def test_spending_reports_from_chunks(extended_sample_transaction_df, tmp_path, monkeypatch):
+    """Тест совпадения отчетов по частям DataFrame с отчетами по всему DataFrame"""
+    monkeypatch.chdir(tmp_path)
+    df = extended_sample_transaction_df
+    chunks = [df.iloc[:3], df.iloc[3:]]
+
+    pd.testing.assert_frame_equal(
+        spending_by_category(iter(chunks), "Супермаркеты", "01.01.2022"),
+        spending_by_category(df, "Супермаркеты", "01.01.2022"),
+    )
+    pd.testing.assert_frame_equal(
+        spending_by_categories(iter(chunks), "01.01.2022"),
+        spending_by_categories(df, "01.01.2022"),
+    )
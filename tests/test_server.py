@@ -0,0 +1,109 @@
+import json
+import threading
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+
+from src.server import create_server
+from src.transactions import TransactionStore, normalize_transactions
+
+
+@pytest.fixture
+def report_server(sample_transactions_df):
+    """Сервер отчетов на свободном порту над хранилищем из примерных транзакций"""
+    store = TransactionStore(normalize_transactions(sample_transactions_df))
+    server = create_server(store, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    """Выполняет GET-запрос и возвращает (код ответа, разобранный JSON)"""
+    try:
+        with urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read().decode("utf-8"))
+    except HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8"))
+
+
+def test_health(report_server):
+    """Тест проверки состояния сервера"""
+    status, body = _get(f"{report_server}/health")
+
+    assert status == 200
+    assert body == {"status": "ok", "transactions": 5}
+
+
+def test_summary(report_server):
+    """Тест сводки за дату по загруженному хранилищу"""
+    with patch("src.views.get_currency_rates", return_value={"USD": 73.21}), \
+            patch("src.views.get_stock_prices", return_value=[]):
+        status, body = _get(f"{report_server}/summary?date={quote('2021-12-31 23:59:59')}")
+
+    assert status == 200
+    assert body["currency_rates"] == [{"currency": "USD", "rate": 73.21}]
+    assert len(body["top_transactions"]) == 3
+    assert {card["last_digits"] for card in body["cards"]} == {"7197", "5091", "4556"}
+
+
+def test_summary_invalid_date(report_server):
+    """Тест ответа 400 на неверный формат даты"""
+    status, body = _get(f"{report_server}/summary?date=31.12.2021")
+
+    assert status == 400
+    assert "date" in body["error"]
+
+
+def test_spending_does_not_write_report(report_server, tmp_path, monkeypatch):
+    """Тест трат по категории: результат возвращается в ответе без записи файла"""
+    monkeypatch.chdir(tmp_path)
+    status, body = _get(f"{report_server}/spending?category={quote('Супермаркеты')}&date=01.01.2022")
+
+    assert status == 200
+    assert len(body) == 1
+    assert body[0]["Описание"] == "Колхоз"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spending_requires_category(report_server):
+    """Тест ответа 400 без обязательного параметра"""
+    status, body = _get(f"{report_server}/spending?date=31.12.2021")
+
+    assert status == 400
+
+
+def test_spending_categories(report_server):
+    """Тест трат по всем категориям"""
+    status, body = _get(f"{report_server}/spending/categories?date=01.01.2022")
+
+    assert status == 200
+    assert [row["Категория"] for row in body] == ["Медицина", "Различные товары", "Супермаркеты", "Каршеринг"]
+
+
+def test_investment(report_server):
+    """Тест суммы для инвесткопилки за месяц"""
+    status, body = _get(f"{report_server}/investment?month=2021-12&limit=50")
+
+    assert status == 200
+    assert body == {"month": "2021-12", "limit": 50, "total": pytest.approx(39.11 + 36 + 42.93)}
+
+
+@pytest.mark.parametrize("query", ["month=12.2021&limit=50", "month=2021-12&limit=abc", "month=2021-12"])
+def test_investment_invalid_params(report_server, query):
+    """Тест ответа 400 на неверные параметры инвесткопилки"""
+    status, _ = _get(f"{report_server}/investment?{query}")
+
+    assert status == 400
+
+
+def test_unknown_path(report_server):
+    """Тест ответа 404 на неизвестный путь"""
+    status, _ = _get(f"{report_server}/unknown")
+
+    assert status == 404
@@ -1,7 +1,15 @@
+import numpy as np
+import pandas as pd
 import pytest
 from datetime import datetime
 
-from src.services import investment_bank
+from src.services import (
+    investment_bank,
+    investment_bank_arrays,
+    investment_bank_chunks,
+    investment_bank_df,
+    investment_bank_matrix,
+)
 
 
 # Тесты на базовую функциональность
@@ -94,3 +102,112 @@ def test_investment_bank_zero_limit(sample_transactions):
     result = investment_bank(month, sample_transactions, limit)
     assert result == 0.00
 
+
+
+# Тесты векторизованного расчета
+@pytest.mark.parametrize("limit", [10, 50, 100, 1000])
+def test_investment_bank_df_matches_list(sample_transactions, limit):
+    """Тест совпадения расчета по DataFrame и по списку словарей."""
+    df = pd.DataFrame(sample_transactions)
+    assert investment_bank_df("2021-12", df, limit) == investment_bank("2021-12", sample_transactions, limit)
+
+
+def test_investment_bank_arrays_skips_invalid_values():
+    """Тест пропуска NaT и NaN в массивах."""
+    dates = np.array(["2021-12-31T16:44:00", "NaT", "2021-12-30T14:48:25"], dtype="datetime64[ns]")
+    amounts = np.array([-160.89, -64.00, np.nan])
+
+    result = investment_bank_arrays("2021-12", dates, amounts, 10)
+    assert result == 9.11
+
+
+def test_investment_bank_df_missing_columns():
+    """Тест расчета по DataFrame без необходимых колонок."""
+    df = pd.DataFrame({"Сумма операции": [-160.89]})
+    assert investment_bank_df("2021-12", df, 10) == 0.00
+
+
+# Тесты таблицы "месяц × лимит"
+def test_investment_bank_matrix_matches_single_calls(sample_transactions):
+    """Тест совпадения таблицы с отдельными расчетами по месяцам и лимитам."""
+    df = pd.DataFrame(sample_transactions)
+    result = investment_bank_matrix(df, months=["2021-11", "2021-12"], limits=[10, 50, 100])
+
+    assert list(result.index) == ["2021-11", "2021-12"]
+    assert list(result.columns) == [10, 50, 100]
+    for month in result.index:
+        for limit in result.columns:
+            assert result.loc[month, limit] == investment_bank(month, sample_transactions, limit)
+
+
+def test_investment_bank_matrix_default_months(sample_transactions):
+    """Тест выбора всех месяцев с тратами по умолчанию."""
+    result = investment_bank_matrix(pd.DataFrame(sample_transactions), limits=[10])
+    assert list(result.index) == ["2021-11", "2021-12"]
+
+
+def test_investment_bank_matrix_invalid_month_and_limit(sample_transactions):
+    """Тест нулевых значений для некорректного месяца и неположительного лимита."""
+    result = investment_bank_matrix(pd.DataFrame(sample_transactions), months=["2021-13", "2021-12"], limits=[0, 10])
+
+    assert result.loc["2021-13"].tolist() == [0.0, 0.0]
+    assert result.loc["2021-12", 0] == 0.0
+    assert abs(result.loc["2021-12", 10] - (9.11 + 6.00 + 1.00)) < 0.01
+
+
+def test_investment_bank_matrix_several_invalid_months(sample_transactions):
+    """Тест нескольких некорректных месяцев: каждый получает нулевую строку."""
+    result = investment_bank_matrix(pd.DataFrame(sample_transactions), months=["bad", "worse", "2021-12"], limits=[10])
+
+    assert list(result.index) == ["bad", "worse", "2021-12"]
+    assert result.loc["bad", 10] == 0.0
+    assert result.loc["worse", 10] == 0.0
+    assert result.loc["2021-12", 10] == investment_bank("2021-12", sample_transactions, 10)
+
+
+def test_investment_bank_matrix_same_month_spellings(sample_transactions):
+    """Тест одного месяца в разной записи: одна строка в виде 'YYYY-MM'."""
+    result = investment_bank_matrix(pd.DataFrame(sample_transactions), months=["2021-12", "2021-1", "2021-01"],
+                                    limits=[10])
+
+    assert list(result.index) == ["2021-12", "2021-01"]
+    assert result.loc["2021-12", 10] == investment_bank("2021-12", sample_transactions, 10)
+    assert result.loc["2021-01", 10] == 0.0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+@pytest.mark.parametrize("limit", [10, 50, 100])
+def test_investment_bank_chunks_matches_df(extended_sample_transaction_df, chunk_size, limit):
+    """Тест совпадения расчета по частям с расчетом по всему DataFrame"""
+    df = extended_sample_transaction_df
+    chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+
+    assert investment_bank_chunks("2021-12", chunks, limit) == investment_bank_df("2021-12", df, limit)
+
+
+def test_investment_bank_chunks_invalid_month(extended_sample_transaction_df):
+    """Тест некорректного месяца при расчете по частям"""
+    assert investment_bank_chunks("2021-13", [extended_sample_transaction_df], 10) == 0.00
+    assert investment_bank_chunks("2021-12", [], 10) == 0.00
+
+
+def test_investment_bank_exact_on_kopecks():
+    """Тест точного расчета в копейках для сумм с ошибкой представления float"""
+    dates = np.array(["2021-12-01", "2021-12-02"], dtype="datetime64[ns]")
+    # 0.1 * 3 * 100 / 1.5 в float дает 20.000000000000004, а не 20.00
+    amounts = np.array([-(0.1 * 3 * 100 / 1.5), -160.89])
+
+    assert investment_bank_arrays("2021-12", dates, amounts, 10) == 9.11
+
+
+def test_investment_bank_df_store_matches_frame(extended_sample_transaction_df):
+    """Тест расчета по хранилищу операций (по суммам в копейках)"""
+    from src.transactions import TransactionStore
+
+    store = TransactionStore(extended_sample_transaction_df)
+    for limit in (10, 50, 100):
+        assert investment_bank_df("2021-12", store, limit) == investment_bank_df(
+            "2021-12", extended_sample_transaction_df, limit
+        )
+    assert investment_bank_df("2021-13", store, 10) == 0.00
+    assert investment_bank_df("2021-12", store, 0) == 0.00
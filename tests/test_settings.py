@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from src import settings, views
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_load_user_settings_missing_file(tmp_path):
+    """Тест настроек по умолчанию при отсутствии файла"""
+    settings.load_user_settings.cache_clear()
+    try:
+        with patch("src.settings.USER_SETTINGS_PATH", tmp_path / "missing.json"):
+            assert settings.load_user_settings() == settings.DEFAULT_USER_SETTINGS
+    finally:
+        settings.load_user_settings.cache_clear()
+
+
+def test_user_setting_prefers_explicit_values():
+    """Тест приоритета значений USER_SETTINGS над файлом настроек"""
+    with patch.dict("src.views.USER_SETTINGS", {"user_currencies": ["CNY"]}, clear=True):
+        assert views.user_setting("user_currencies") == ["CNY"]
+        assert views.user_setting("user_stocks") == settings.load_user_settings()["user_stocks"]
+        assert views.user_setting("unknown", "default") == "default"
+
+
+def test_env_setting_reads_environment(monkeypatch):
+    """Тест параметров окружения: значение из переменной окружения или значение по умолчанию"""
+    monkeypatch.setenv("STOCKS_BATCH_SIZE", "3")
+    monkeypatch.delenv("STOCKS_RATE_LIMIT", raising=False)
+
+    assert settings.env_setting("STOCKS_BATCH_SIZE") == "3"
+    assert settings.env_setting("STOCKS_RATE_LIMIT", views.DEFAULT_STOCKS_RATE_LIMIT) == "5"
+
+
+def test_stocks_rate_limiter_below_one_request_per_second(monkeypatch):
+    """Тест ограничителя котировок при лимите меньше одного запроса в секунду"""
+    monkeypatch.setenv("STOCKS_RATE_LIMIT", "0.5")
+    monkeypatch.setattr(views, "_stocks_rate_limiter", None)
+
+    limiter = views._get_stocks_rate_limiter()
+
+    assert limiter.rate == 0.5
+    assert limiter.acquire(timeout=0)
+
+
+def test_settings_command_does_not_import_pandas():
+    """Тест команды settings: выводит настройки без импорта pandas и requests"""
+    code = (
+        "import sys, runpy; sys.argv = ['main.py', 'settings']; "
+        "runpy.run_path('src/main.py', run_name='__main__'); "
+        "print('pandas' in sys.modules, 'requests' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0
+    assert "user_currencies" in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "False False"
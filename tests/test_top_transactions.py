@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from src.top_transactions import TopTransactionsAccumulator, top_positions, top_transactions, top_transactions_by
+from src.transactions import normalize_transactions
+
+
+@pytest.fixture
+def expenses_df(extended_sample_transaction_df):
+    """Фикстура с нормализованными операциями и повторяющимися суммами"""
+    df = extended_sample_transaction_df.copy()
+    df.loc[5, "Сумма платежа"] = -564.00
+    return normalize_transactions(df)
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 2, 3, 10])
+def test_top_positions_matches_nlargest(top_n):
+    """Тест совпадения порядка с nlargest(keep="first"), включая равные значения"""
+    values = np.array([5.0, 1.0, 7.0, 5.0, 7.0, 3.0, 5.0])
+
+    expected = pd.Series(values).nlargest(top_n, keep="first").index.to_numpy() if top_n < len(values) \
+        else pd.Series(values).sort_values(ascending=False, kind="stable").index.to_numpy()[:top_n]
+
+    assert top_positions(values, top_n).tolist() == expected.tolist()
+
+
+def test_top_transactions_records(expenses_df):
+    """Тест формата записей и выбора расходов без iterrows"""
+    with patch.object(pd.DataFrame, "iterrows", side_effect=AssertionError("iterrows")):
+        result = top_transactions(expenses_df, top_n=3)
+
+    assert [record["amount"] for record in result] == [7240.00, 564.00, 564.00]
+    assert result[1] == {
+        "date": "31.12.2021 01:23:42",
+        "amount": 564.00,
+        "category": "Различные товары",
+        "description": "Ozon.ru",
+        "card_last_digits": "5091",
+    }
+    assert result[2]["description"] == "Дикси"
+
+
+def test_top_transactions_by_card_and_category(expenses_df):
+    """Тест выбора крупнейших расходов по каждой карте и категории за один проход"""
+    by_card = top_transactions_by(expenses_df, "Номер карты", top_n=1)
+    by_category = top_transactions_by(expenses_df, "Категория", top_n=5)
+
+    assert {card: [r["amount"] for r in records] for card, records in by_card.items()} == {
+        "1234567812347197": [7240.00],
+        "1234567812345091": [564.00],
+    }
+    assert [r["description"] for r in by_category["Супермаркеты"]] == ["Дикси", "Колхоз"]
+    assert "Пополнение" not in by_category
+    for category, records in by_category.items():
+        assert records == top_transactions(expenses_df[expenses_df["Категория"] == category], top_n=5)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4])
+def test_accumulator_matches_full_selection(expenses_df, chunk_size):
+    """Тест слияния крупнейших расходов частей через ограниченную кучу"""
+    accumulator = TopTransactionsAccumulator(top_n=3)
+    for start in range(0, len(expenses_df), chunk_size):
+        accumulator.add(expenses_df.iloc[start:start + chunk_size])
+
+    assert accumulator.result() == top_transactions(expenses_df, top_n=3)
+
+
+def test_top_transactions_without_expenses(expenses_df):
+    """Тест пустого результата без расходов"""
+    incomes = expenses_df[expenses_df["Сумма платежа"] > 0]
+
+    assert top_transactions(incomes) == []
+    assert top_transactions_by(incomes, "Категория") == {}
+    accumulator = TopTransactionsAccumulator()
+    accumulator.add(incomes)
+    assert accumulator.result() == []
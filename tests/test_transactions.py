@@ -0,0 +1,214 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from src import views
+from src.reports import spending_by_category
+from src.services import investment_bank
+from src.transactions import (
+    TransactionStore,
+    data_fingerprint,
+    from_kopecks,
+    is_normalized,
+    normalize_transactions,
+    parse_operation_dates,
+    to_kopecks,
+)
+
+
+def test_normalize_transactions_types(sample_transactions_df):
+    """Тест приведения типов колонок в каноническом DataFrame"""
+    result = normalize_transactions(sample_transactions_df)
+
+    assert is_normalized(result)
+    assert result["Сумма операции"].dtype == "float64"
+    assert isinstance(result["Категория"].dtype, pd.CategoricalDtype)
+    assert isinstance(result["Номер карты"].dtype, pd.CategoricalDtype)
+    # Исходный DataFrame не изменяется
+    assert not is_normalized(sample_transactions_df)
+
+
+def test_normalize_transactions_invalid_date():
+    """Тест некорректных дат при нормализации"""
+    df = pd.DataFrame({"Дата операции": ["31.12.2021 16:44:00", "имеется"], "Сумма операции": [-1.0, -2.0]})
+    result = normalize_transactions(df)
+    assert pd.isna(result["Дата операции"].iloc[1])
+
+
+def test_is_normalized_without_date_column():
+    """Тест проверки DataFrame без колонки дат"""
+    assert not is_normalized(pd.DataFrame({"Сумма операции": [1.0]}))
+
+
+def test_parse_operation_dates_skips_parsed(sample_transactions_df):
+    """Тест отсутствия повторного разбора уже преобразованных дат"""
+    dates = normalize_transactions(sample_transactions_df)["Дата операции"]
+    with patch("src.transactions.pd.to_datetime") as mock_to_datetime:
+        result = parse_operation_dates(dates)
+        mock_to_datetime.assert_not_called()
+    assert result is dates
+
+
+def test_reports_skip_parsing_for_normalized(sample_transactions_df):
+    """Тест работы отчетов с каноническим DataFrame без повторного разбора дат"""
+    normalized = normalize_transactions(sample_transactions_df)
+
+    with patch("src.views.parse_operation_dates") as mock_views_parse, \
+            patch("src.reports.parse_operation_dates") as mock_reports_parse:
+        filtered = views.filter_data_by_date(normalized, "2021-12-31 23:59:59")
+        spending = spending_by_category(normalized, "Медицина", "31.12.2021")
+        mock_views_parse.assert_not_called()
+        mock_reports_parse.assert_not_called()
+
+    assert len(filtered) == 4
+    assert len(spending) == 1
+
+
+@pytest.mark.parametrize("limit, expected", [(10, 9.11 + 6.00 + 1.00), (100, 39.11 + 36.00 + 51.00)])
+def test_investment_bank_accepts_datetime(sample_transactions, limit, expected):
+    """Тест расчета инвесткопилки по записям с уже разобранными датами"""
+    df = normalize_transactions(pd.DataFrame(sample_transactions))
+    transactions = df[["Дата операции", "Сумма операции"]].to_dict("records")
+
+    result = investment_bank("2021-12", transactions, limit)
+    assert abs(result - expected) < 0.01
+
+
+# Тесты для TransactionStore
+def test_transaction_store_sorted(sample_transactions_df):
+    """Тест сортировки операций в хранилище по дате"""
+    store = TransactionStore(sample_transactions_df)
+
+    assert len(store) == 5
+    assert store.df["Дата операции"].is_monotonic_increasing
+
+
+def test_transaction_store_window_bounds(sample_transactions_df):
+    """Тест включения границ интервала в окно"""
+    store = TransactionStore(sample_transactions_df)
+    result = store.window(datetime(2021, 12, 30, 17, 50, 30), datetime(2021, 12, 31, 1, 23, 42))
+
+    assert result["Описание"].tolist() == ["Пополнение через Газпромбанк", "Ситидрайв", "Ozon.ru"]
+
+
+def test_transaction_store_window_is_view(sample_transactions_df):
+    """Тест выбора окна без копирования данных"""
+    store = TransactionStore(sample_transactions_df)
+    result = store.month_to_date(datetime(2021, 12, 31, 23, 59, 59))
+
+    assert len(result) == 4
+    assert np.shares_memory(result["Сумма операции"].to_numpy(), store.df["Сумма операции"].to_numpy())
+
+
+def test_transaction_store_skips_invalid_dates():
+    """Тест исключения операций с нераспознанной датой из окон"""
+    df = pd.DataFrame({"Дата операции": ["имеется", "31.12.2021 16:44:00"], "Сумма операции": [-1.0, -2.0]})
+    store = TransactionStore(df)
+
+    assert len(store) == 2
+    assert store.last_days(datetime(2021, 12, 31, 23, 59, 59))["Сумма операции"].tolist() == [-2.0]
+
+
+def test_store_matches_dataframe_filters(extended_sample_transaction_df):
+    """Тест совпадения фильтрации через хранилище и через DataFrame"""
+    store = TransactionStore(extended_sample_transaction_df)
+
+    by_store = views.filter_data_by_date(store, "2021-12-31 23:59:59")
+    by_frame = views.filter_data_by_date(extended_sample_transaction_df.copy(), "2021-12-31 23:59:59")
+    assert sorted(by_store["Описание"]) == sorted(by_frame["Описание"])
+
+    for category in ["Супермаркеты", "Медицина", "Несуществующая"]:
+        expected = spending_by_category(extended_sample_transaction_df, category, "31.12.2021")
+        result = spending_by_category(store, category, "31.12.2021")
+        assert result["Описание"].tolist() == expected["Описание"].tolist()
+
+
+def test_data_fingerprint_tracks_changes(sample_transactions_df):
+    """Тест изменения отпечатка при изменении данных"""
+    fingerprint = data_fingerprint(sample_transactions_df)
+    changed = sample_transactions_df.copy()
+    changed.loc[0, "Сумма операции"] += 1
+
+    assert data_fingerprint(sample_transactions_df.copy()) == fingerprint
+    assert data_fingerprint(changed) != fingerprint
+    assert TransactionStore(sample_transactions_df).fingerprint is not None
+
+
+# Тесты добавления операций в хранилище
+def test_store_append_matches_full_build(extended_sample_transaction_df):
+    """Тест совпадения хранилища после добавления с построенным по всем операциям"""
+    df = extended_sample_transaction_df
+    store = TransactionStore(df.iloc[:4])
+    for by in ("card", "category", "month"):
+        store.aggregates(by)
+
+    added = store.append(df.iloc[2:])
+
+    assert added.tolist() == [False, False, True, True]
+    expected = TransactionStore(df)
+    pd.testing.assert_frame_equal(
+        store.df.astype({"Категория": object, "Номер карты": object}),
+        expected.df.astype({"Категория": object, "Номер карты": object}),
+    )
+    for by in ("card", "category", "month"):
+        pd.testing.assert_frame_equal(store.aggregates(by), expected.aggregates(by))
+
+
+def test_store_append_counts_duplicates(sample_transactions_df):
+    """Тест учета одинаковых операций с кратностью"""
+    store = TransactionStore(sample_transactions_df.iloc[[0]])
+
+    added = store.append(sample_transactions_df.iloc[[0, 0, 1]])
+
+    assert added.tolist() == [False, True, True]
+    assert len(store) == 3
+
+
+def test_store_append_updates_windows_and_fingerprint(extended_sample_transaction_df):
+    """Тест обновления окон по датам и отпечатка после добавления"""
+    store = TransactionStore(extended_sample_transaction_df.iloc[:3])
+    fingerprint = store.fingerprint
+
+    store.append(extended_sample_transaction_df)
+
+    assert store.fingerprint != fingerprint
+    window = store.window(datetime(2021, 11, 1), datetime(2021, 12, 31, 23, 59, 59))
+    assert len(window) == len(extended_sample_transaction_df)
+    assert window["Дата операции"].is_monotonic_increasing
+
+
+def test_store_aggregates(extended_sample_transaction_df):
+    """Тест агрегатов по месяцам"""
+    months = TransactionStore(extended_sample_transaction_df).aggregates("month")
+
+    assert list(months.index) == ["2021-11", "2021-12"]
+    assert months.loc["2021-12", "Количество операций"] == 5
+    assert months.loc["2021-11", "Сумма расходов"] == pytest.approx(-7240.00)
+    with pytest.raises(ValueError):
+        TransactionStore(extended_sample_transaction_df).aggregates("year")
+
+
+# Тесты целочисленного представления сумм и дат
+def test_to_kopecks():
+    """Тест перевода сумм в копейки"""
+    result = to_kopecks(pd.Series([-160.89, 0.1 + 0.2, float("nan"), 5046.0]))
+
+    assert result.dtype == np.int64
+    assert result.tolist() == [-16089, 30, 0, 504600]
+    assert from_kopecks(-16089) == -160.89
+
+
+def test_store_integer_columns(extended_sample_transaction_df):
+    """Тест хранения дат как int64 эпохи и сумм как int64 копеек"""
+    store = TransactionStore(extended_sample_transaction_df)
+
+    assert store.kopecks().tolist() == to_kopecks(store.df["Сумма операции"]).tolist()
+    assert store.epoch_ns().tolist() == store.df["Дата операции"].astype("int64").tolist()
+    with pytest.raises(ValueError):
+        store.kopecks()[0] = 0
+
+    left, right = store.bounds(datetime(2021, 12, 1), datetime(2022, 1, 1), inclusive_end=False)
+    assert right - left == 5
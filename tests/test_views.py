@@ -1,4 +1,7 @@
 
+import threading
+import time
+
 import pytest
 import pandas as pd
 from unittest.mock import patch, Mock, MagicMock
@@ -188,7 +191,7 @@ def test_get_currency_rates_no_user_currencies():
 def test_get_stock_prices_success(mock_user_settings):
     """Тест успешного получения цен на акции"""
     with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
-        with patch('src.views.requests.get') as mock_get:
+        with patch('src.views.requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = [{"price": 150.25}]
@@ -204,21 +207,22 @@ def test_get_stock_prices_success(mock_user_settings):
 def test_get_stock_prices_rate_limit(mock_user_settings):
     """Тест превышения лимита запросов для акций"""
     with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
-        with patch('src.views.requests.get') as mock_get:
+        with patch('src.views.requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 429  # Too Many Requests
             mock_get.return_value = mock_response
 
             result = views.get_stock_prices()
 
-            assert len(result) == 6
+            # По одному результату на каждую акцию
+            assert len(result) == 3
             assert result[0]["error"] == "Превышен лимит запросов API"
 
 
 def test_get_stock_prices_timeout(mock_user_settings):
     """Тест таймаута при запросе акций"""
     with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
-        with patch('src.views.requests.get', side_effect=views.requests.exceptions.Timeout):
+        with patch('src.views.requests.Session.get', side_effect=views.requests.exceptions.Timeout):
             result = views.get_stock_prices()
 
             assert len(result) == 3
@@ -228,7 +232,7 @@ def test_get_stock_prices_timeout(mock_user_settings):
 def test_get_stock_prices_empty_response(mock_user_settings):
     """Тест пустого ответа от API акций"""
     with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
-        with patch('src.views.requests.get') as mock_get:
+        with patch('src.views.requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = []  # Пустой список
@@ -246,6 +250,85 @@ def test_get_stock_prices_no_user_stocks():
         assert result == []
 
 
+def test_get_stock_prices_concurrent(mock_user_settings, stub_stocks_server):
+    """Тест параллельного получения котировок с сохранением порядка настроек"""
+    stub_stocks_server.prices.update({"AAPL": 150.25, "AMZN": 175.5, "GOOGL": 140.0})
+    stub_stocks_server.delays.update({"AAPL": 0.4, "AMZN": 0.4, "GOOGL": 0.4})
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch.dict('os.environ', {"STOCKS_API_URL": stub_stocks_server.url}):
+            started = time.monotonic()
+            result = views.get_stock_prices()
+            elapsed = time.monotonic() - started
+
+    assert result == [
+        {"stock": "AAPL", "price": 150.25},
+        {"stock": "AMZN", "price": 175.5},
+        {"stock": "GOOGL", "price": 140.0},
+    ]
+    # Запросы выполняются одновременно, а не друг за другом
+    assert elapsed < 1.0
+
+
+def test_get_stock_prices_deadline(mock_user_settings, stub_stocks_server):
+    """Тест общего дедлайна: медленная котировка не задерживает ответ"""
+    stub_stocks_server.delays["AMZN"] = 2
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch.dict('os.environ', {"STOCKS_API_URL": stub_stocks_server.url}):
+            started = time.monotonic()
+            result = views.get_stock_prices(deadline=0.5)
+            elapsed = time.monotonic() - started
+
+    assert [item["stock"] for item in result] == ["AAPL", "AMZN", "GOOGL"]
+    assert result[0]["price"] == 100.0
+    assert result[1]["price"] == 0
+    assert result[2]["price"] == 100.0
+    assert elapsed < 1.5
+
+
+def test_get_stock_prices_batch_request(mock_user_settings, stub_stocks_server):
+    """Тест получения нескольких котировок одним запросом"""
+    stub_stocks_server.prices.update({"AAPL": 150.25, "AMZN": 175.5, "GOOGL": 140.0})
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch.dict('os.environ', {"STOCKS_API_URL": stub_stocks_server.url, "STOCKS_BATCH_SIZE": "2"}):
+            result = views.get_stock_prices()
+
+    assert sorted(stub_stocks_server.requested) == ["AAPL,AMZN", "GOOGL"]
+    assert [item["price"] for item in result] == [150.25, 175.5, 140.0]
+
+
+def test_get_stock_prices_coalesces_concurrent_requests(mock_user_settings, stub_stocks_server):
+    """Тест объединения одинаковых запросов из одновременных сводок"""
+    stub_stocks_server.delays.update({"AAPL": 0.3, "AMZN": 0.3, "GOOGL": 0.3})
+    results = []
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch.dict('os.environ', {"STOCKS_API_URL": stub_stocks_server.url}):
+            threads = [threading.Thread(target=lambda: results.append(views.get_stock_prices())) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    assert len(results) == 3
+    assert all([item["price"] for item in result] == [100.0] * 3 for result in results)
+    assert sorted(stub_stocks_server.requested) == ["AAPL", "AMZN", "GOOGL"]
+
+
+def test_get_stock_prices_retries_rate_limited(mock_user_settings, stub_stocks_server):
+    """Тест повтора запроса после ответа 429 без потери тикера"""
+    stub_stocks_server.rate_limited["AMZN"] = 2
+
+    with patch.dict('src.views.USER_SETTINGS', mock_user_settings):
+        with patch.dict('os.environ', {"STOCKS_API_URL": stub_stocks_server.url}):
+            result = views.get_stock_prices()
+
+    assert [item["price"] for item in result] == [100.0, 100.0, 100.0]
+    assert stub_stocks_server.requested.count("AMZN") == 3
+
+
 # Тесты для create_summary_json()
 def test_create_summary_json_valid(sample_transactions_df, mock_user_settings):
     """Тест создания JSON-сводки"""
@@ -284,4 +367,76 @@ def test_create_summary_json_filter_error(sample_transactions_df):
             # Должны быть вызваны остальные функции
             assert "greeting" in result
             assert "cards" in result
-            mock_logger.error.assert_called()
\ No newline at end of file
+            mock_logger.error.assert_called()
+
+# Тесты для CardSummaryAccumulator
+def test_card_summary_accumulator_matches_full_summary(sample_transactions_df):
+    """Тест совпадения накопленной статистики с расчетом по всем данным"""
+    accumulator = views.CardSummaryAccumulator()
+    accumulator.add(sample_transactions_df.iloc[:2])
+    accumulator.add(sample_transactions_df.iloc[2:])
+
+    assert accumulator.summary() == views.get_card_summary(sample_transactions_df)
+
+
+def test_card_summary_accumulator_empty(empty_transactions_df):
+    """Тест накопителя без операций"""
+    accumulator = views.CardSummaryAccumulator()
+    accumulator.add(empty_transactions_df)
+    assert accumulator.summary() == []
+
+
+def test_get_card_summary_keeps_card_order(sample_transactions_df):
+    """Тест порядка карт в статистике (по первому появлению)"""
+    result = views.get_card_summary(sample_transactions_df)
+    assert [card["card_last_digits"] for card in result] == ["7197", "5091", "4556"]
+
+
+def test_create_summary_json_network_sections_in_parallel(sample_transactions_df):
+    """Тест параллельного получения курсов валют и котировок"""
+
+    def slow_rates():
+        time.sleep(0.3)
+        return {"USD": 91.5}
+
+    def slow_stocks():
+        time.sleep(0.3)
+        return [{"stock": "AAPL", "price": 150.25}]
+
+    with patch('src.views.get_currency_rates', side_effect=slow_rates):
+        with patch('src.views.get_stock_prices', side_effect=slow_stocks):
+            started = time.monotonic()
+            result = views.create_summary_json(sample_transactions_df, "2021-12-31 23:59:59")
+            elapsed = time.monotonic() - started
+
+    assert elapsed < 0.55
+    assert result["currency_rates"] == [{"currency": "USD", "rate": 91.5}]
+
+    timings = result["meta"]["timings_ms"]
+    for section in ["filter", "greeting", "cards", "top_transactions", "currency_rates", "stock_prices", "total"]:
+        assert section in timings
+    assert timings["currency_rates"] >= 300
+
+
+def test_create_summary_json_network_section_error(sample_transactions_df):
+    """Тест сводки при исключении в сетевом разделе"""
+    with patch('src.views.get_currency_rates', side_effect=RuntimeError("API error")):
+        with patch('src.views.get_stock_prices', return_value=[]):
+            result = views.create_summary_json(sample_transactions_df, "2021-12-31 23:59:59")
+
+    assert result["currency_rates"] == []
+    assert result["meta"]["timings_ms"]["currency_rates"] is None
+    assert len(result["cards"]) == 3
+
+
+def test_get_card_summary_chunks(extended_sample_transaction_df):
+    """Тест статистики по картам для данных, поступающих частями"""
+    df = extended_sample_transaction_df
+    chunks = [df.iloc[:2].copy(), df.iloc[2:5].copy(), df.iloc[5:].copy()]
+
+    result = views.get_card_summary_chunks(chunks, "2021-12-31 23:59:59")
+    expected = views.get_card_summary(views.filter_data_by_date(df.copy(), "2021-12-31 23:59:59"))
+
+    assert sorted(result, key=lambda card: card["card_last_digits"]) == sorted(
+        expected, key=lambda card: card["card_last_digits"]
+    )